@@ -169,6 +169,43 @@ proc tribal_village_reset_and_get_obs(
   except CatchableError:
     return 0
 
+proc stepIntoBuffers(
+  actions_buffer: ptr UncheckedArray[uint16],
+  obs_buffer: ptr UncheckedArray[uint8],
+  rewards_buffer: ptr UncheckedArray[float32],
+  terminals_buffer: ptr UncheckedArray[uint8],
+  truncations_buffer: ptr UncheckedArray[uint8]
+) =
+  ## Advance globalEnv one step and write the results into the given buffers.
+  var actions: array[MapAgents, uint16]
+
+  # When BuiltinAI or HybridAI is active, let the scripted AI generate actions
+  # instead of reading from the Python buffer (which would be all-zeros/NOOPs).
+  if not isNil(globalController) and
+     globalController.controllerType in {BuiltinAI, HybridAI}:
+    actions = getActions(globalEnv)
+  else:
+    # Read actions directly from buffer (no conversion)
+    copyMem(addr actions[0], actions_buffer, sizeof(actions))
+
+  # Step environment
+  globalEnv.step(unsafeAddr actions)
+
+  # Lazy rebuild: only rebuild observations if dirty and being accessed
+  globalEnv.ensureObservations()
+
+  # Direct memory copy of observations (zero conversion overhead)
+  copyMem(obs_buffer, globalEnv.observations.addr,
+    MapAgents * ObservationLayers * ObservationWidth * ObservationHeight)
+  applyObscuredMask(globalEnv, obs_buffer)
+
+  # Direct buffer writes from contiguous rewards array (SIMD-friendly)
+  copyMem(rewards_buffer, globalEnv.rewards.addr, MapAgents * sizeof(float32))
+  zeroMem(globalEnv.rewards.addr, MapAgents * sizeof(float32))
+  for i in 0..<MapAgents:
+    terminals_buffer[i] = if globalEnv.terminated[i] > 0.0: 1 else: 0
+    truncations_buffer[i] = if globalEnv.truncated[i] > 0.0: 1 else: 0
+
 proc tribal_village_step_with_pointers(
   env: pointer,
   actions_buffer: ptr UncheckedArray[uint16],   # [MapAgents] direct read
@@ -179,39 +216,36 @@ proc tribal_village_step_with_pointers(
 ): int32 {.exportc, dynlib.} =
   ## Ultra-fast step with direct buffer access
   try:
-    var actions: array[MapAgents, uint16]
-
-    # When BuiltinAI or HybridAI is active, let the scripted AI generate actions
-    # instead of reading from the Python buffer (which would be all-zeros/NOOPs).
-    if not isNil(globalController) and
-       globalController.controllerType in {BuiltinAI, HybridAI}:
-      actions = getActions(globalEnv)
-    else:
-      # Read actions directly from buffer (no conversion)
-      copyMem(addr actions[0], actions_buffer, sizeof(actions))
-
-    # Step environment
-    globalEnv.step(unsafeAddr actions)
-
-    # Lazy rebuild: only rebuild observations if dirty and being accessed
-    globalEnv.ensureObservations()
-
-    # Direct memory copy of observations (zero conversion overhead)
-    copyMem(obs_buffer, globalEnv.observations.addr,
-      MapAgents * ObservationLayers * ObservationWidth * ObservationHeight)
-    applyObscuredMask(globalEnv, obs_buffer)
-
-    # Direct buffer writes from contiguous rewards array (SIMD-friendly)
-    copyMem(rewards_buffer, globalEnv.rewards.addr, MapAgents * sizeof(float32))
-    zeroMem(globalEnv.rewards.addr, MapAgents * sizeof(float32))
-    for i in 0..<MapAgents:
-      terminals_buffer[i] = if globalEnv.terminated[i] > 0.0: 1 else: 0
-      truncations_buffer[i] = if globalEnv.truncated[i] > 0.0: 1 else: 0
-
+    stepIntoBuffers(actions_buffer, obs_buffer, rewards_buffer,
+      terminals_buffer, truncations_buffer)
     return 1
   except CatchableError:
     return 0
 
+proc tribal_village_step_batch(
+  env: pointer,
+  actions_buffer: ptr UncheckedArray[uint16],   # [nSteps, MapAgents] direct read
+  nSteps: int32,
+  obs_buffer: ptr UncheckedArray[uint8],        # [nSteps, MapAgents, ObservationLayers, 11, 11]
+  rewards_buffer: ptr UncheckedArray[float32],  # [nSteps, MapAgents]
+  terminals_buffer: ptr UncheckedArray[uint8],  # [nSteps, MapAgents]
+  truncations_buffer: ptr UncheckedArray[uint8] # [nSteps, MapAgents]
+): int32 {.exportc, dynlib.} =
+  ## Run nSteps consecutive steps in one call, writing step i into slab i of
+  ## each output buffer. Returns the number of steps completed.
+  try:
+    for i in 0 ..< int(nSteps):
+      let agentBase = i * MapAgents
+      stepIntoBuffers(
+        cast[ptr UncheckedArray[uint16]](addr actions_buffer[agentBase]),
+        cast[ptr UncheckedArray[uint8]](addr obs_buffer[i * MapAgents * ObsAgentStride]),
+        cast[ptr UncheckedArray[float32]](addr rewards_buffer[agentBase]),
+        cast[ptr UncheckedArray[uint8]](addr terminals_buffer[agentBase]),
+        cast[ptr UncheckedArray[uint8]](addr truncations_buffer[agentBase]))
+      result = int32(i + 1)
+  except CatchableError:
+    discard
+
 proc tribal_village_get_num_agents(): int32 {.exportc, dynlib.} =
   MapAgents.int32
 
@@ -13,7 +13,12 @@ import std/[tables, hashes]
 import ../common_types  # for nowSeconds
 
 type
+  MemoClock* = proc(): float64 {.nimcall.}
+    ## Time source in seconds. Defaults to nowSeconds; tests inject a fake.
+
   MemoEntry[V] = object
+    ## Stored inline in the table (no per-entry heap object); read in place
+    ## via withValue so hits neither hash twice nor copy the entry.
     value: V
     timestamp: float64
 
@@ -24,30 +29,40 @@ type
     maxAge: float64
     lastCleanup: float64
     cleanupInterval: float64  # How often to run cleanup (in seconds)
+    clock: MemoClock
+    expiredKeys: seq[K]  # Scratch list reused by cleanup()
 
 const
   DefaultMaxAge* = 1.0  ## Default max age for cache entries (1 second)
   DefaultCleanupInterval* = 5.0  ## How often to purge expired entries
 
 proc initTimedMemoCache*[K, V](maxAge: float64 = DefaultMaxAge,
-                                cleanupInterval: float64 = DefaultCleanupInterval): TimedMemoCache[K, V] =
+                                cleanupInterval: float64 = DefaultCleanupInterval,
+                                clock: MemoClock = nowSeconds): TimedMemoCache[K, V] =
   ## Initialize a new time-bound memo cache.
   ## maxAge: entries older than this (in seconds) are considered stale
   ## cleanupInterval: how often to purge expired entries
+  ## clock: time source used for timestamps and expiry checks
   result.cache = initTable[K, MemoEntry[V]]()
   result.maxAge = maxAge
-  result.lastCleanup = nowSeconds()
+  result.clock = clock
+  result.lastCleanup = clock()
   result.cleanupInterval = cleanupInterval
 
+proc currentTime[K, V](cache: TimedMemoCache[K, V]): float64 {.inline.} =
+  ## Read the cache's clock; a default-initialized cache has none, so fall
+  ## back to nowSeconds instead of calling a nil proc.
+  if cache.clock.isNil: nowSeconds() else: cache.clock()
+
 proc cleanup*[K, V](cache: var TimedMemoCache[K, V]) =
   ## Remove all expired entries from the cache.
   ## Called automatically during get() based on cleanupInterval.
-  let now = nowSeconds()
-  var keysToRemove: seq[K]
+  let now = cache.currentTime()
+  cache.expiredKeys.setLen(0)
   for key, entry in cache.cache.pairs:
     if now - entry.timestamp >= cache.maxAge:
-      keysToRemove.add(key)
-  for key in keysToRemove:
+      cache.expiredKeys.add(key)
+  for key in cache.expiredKeys:
     cache.cache.del(key)
   cache.lastCleanup = now
 
@@ -60,11 +75,10 @@ proc get*[K, V](cache: var TimedMemoCache[K, V], key: K,
                 compute: proc(): V): V =
   ## Get cached value or compute and cache if stale/missing.
   ## The compute proc takes no arguments and returns the result.
-  let now = nowSeconds()
+  let now = cache.currentTime()
   cache.maybeCleanup(now)
 
-  if key in cache.cache:
-    let entry = cache.cache[key]
+  cache.cache.withValue(key, entry):
     if now - entry.timestamp < cache.maxAge:
       return entry.value
 
@@ -76,11 +90,10 @@ proc getWithArg*[K, V, A](cache: var TimedMemoCache[K, V], key: K, arg: A,
                            compute: proc(a: A): V): V =
   ## Get cached value or compute and cache if stale/missing.
   ## The compute proc takes one argument and returns the result.
-  let now = nowSeconds()
+  let now = cache.currentTime()
   cache.maybeCleanup(now)
 
-  if key in cache.cache:
-    let entry = cache.cache[key]
+  cache.cache.withValue(key, entry):
     if now - entry.timestamp < cache.maxAge:
       return entry.value
 
@@ -92,11 +105,10 @@ proc getWith2Args*[K, V, A, B](cache: var TimedMemoCache[K, V], key: K, arg1: A,
                                compute: proc(a: A, b: B): V): V =
   ## Get cached value or compute and cache if stale/missing.
   ## The compute proc takes two arguments and returns the result.
-  let now = nowSeconds()
+  let now = cache.currentTime()
   cache.maybeCleanup(now)
 
-  if key in cache.cache:
-    let entry = cache.cache[key]
+  cache.cache.withValue(key, entry):
     if now - entry.timestamp < cache.maxAge:
       return entry.value
 
@@ -129,10 +141,10 @@ proc setMaxAge*[K, V](cache: var TimedMemoCache[K, V], maxAge: float64) =
 const
   FrameCacheMaxAge* = 0.02  ## ~50 FPS frame time
 
-proc initFrameCache*[K, V](): TimedMemoCache[K, V] =
+proc initFrameCache*[K, V](clock: MemoClock = nowSeconds): TimedMemoCache[K, V] =
   ## Initialize a frame-scoped cache (very short max age).
   ## Use for expensive evaluations that don't change within a frame.
-  initTimedMemoCache[K, V](maxAge = FrameCacheMaxAge, cleanupInterval = 1.0)
+  initTimedMemoCache[K, V](maxAge = FrameCacheMaxAge, cleanupInterval = 1.0, clock = clock)
 
 # ---------------------------------------------------------------------------
 # Convenience: Position-based cache key helpers
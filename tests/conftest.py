@@ -1,24 +1,22 @@
 """Pytest configuration and fixtures for tribal_village tests."""
 
+import sys
+
 import pytest
 from pathlib import Path
 
+_LIB_NAME = "libtribal_village" + (
+    ".dylib" if sys.platform == "darwin" else ".dll" if sys.platform == "win32" else ".so"
+)
+
+
 # Check if Nim library is available
 def _nim_library_available() -> bool:
     """Check if the compiled Nim library exists."""
-    import platform
-
-    if platform.system() == "Darwin":
-        lib_name = "libtribal_village.dylib"
-    elif platform.system() == "Windows":
-        lib_name = "libtribal_village.dll"
-    else:
-        lib_name = "libtribal_village.so"
-
     package_dir = Path(__file__).resolve().parent.parent / "tribal_village_env"
     candidate_paths = [
-        package_dir.parent / lib_name,
-        package_dir / lib_name,
+        package_dir.parent / _LIB_NAME,
+        package_dir / _LIB_NAME,
     ]
 
     return any(path.exists() for path in candidate_paths)
@@ -1,8 +1,16 @@
-import std/[unittest, os]
+import std/unittest
 import scripted/memoization
 import common_types
 import vmath
 
+# Deterministic clock so expiry tests advance time instead of sleeping.
+var fakeNow = 0.0
+
+proc fakeClock(): float64 = fakeNow
+
+proc advance(seconds: float64) =
+  fakeNow += seconds
+
 # =============================================================================
 # TimedMemoCache Basic Operations
 # =============================================================================
@@ -21,6 +29,11 @@ suite "TimedMemoCache - Initialization":
     var cache = initTimedMemoCache[int, string](cleanupInterval = 10.0)
     check cache.len == 0
 
+  test "default-initialized cache falls back to the wall clock":
+    var cache = default(TimedMemoCache[int, int])
+    check cache.get(1, proc(): int = 42) == 42
+    cache.cleanup()
+
 suite "TimedMemoCache - Get Operations":
   test "computes value on first access":
     var cache = initTimedMemoCache[int, int]()
@@ -65,7 +78,7 @@ suite "TimedMemoCache - Get Operations":
     check cache.len == 3
 
   test "recomputes after expiry":
-    var cache = initTimedMemoCache[int, int](maxAge = 0.01)  # 10ms
+    var cache = initTimedMemoCache[int, int](maxAge = 0.01, clock = fakeClock)  # 10ms
     var computeCount = 0
 
     discard cache.get(1, proc(): int =
@@ -73,8 +86,7 @@ suite "TimedMemoCache - Get Operations":
       42
     )
 
-    # Wait for expiry
-    sleep(20)  # 20ms > 10ms maxAge
+    advance(0.02)  # 20ms > 10ms maxAge
 
     let result = cache.get(1, proc(): int =
       computeCount += 1
@@ -165,13 +177,13 @@ suite "TimedMemoCache - Manual Operations":
     check cache.len == 0
 
   test "setMaxAge changes expiry threshold":
-    var cache = initTimedMemoCache[int, int](maxAge = 10.0)
+    var cache = initTimedMemoCache[int, int](maxAge = 10.0, clock = fakeClock)
 
     discard cache.get(1, proc(): int = 42)
 
     cache.setMaxAge(0.001)  # 1ms
 
-    sleep(10)
+    advance(0.01)
 
     var computeCount = 0
     let result = cache.get(1, proc(): int =
@@ -184,13 +196,14 @@ suite "TimedMemoCache - Manual Operations":
 
 suite "TimedMemoCache - Cleanup":
   test "cleanup removes expired entries":
-    var cache = initTimedMemoCache[int, int](maxAge = 0.01, cleanupInterval = 0.001)
+    var cache = initTimedMemoCache[int, int](maxAge = 0.01, cleanupInterval = 0.001,
+                                             clock = fakeClock)
 
     discard cache.get(1, proc(): int = 10)
     discard cache.get(2, proc(): int = 20)
     check cache.len == 2
 
-    sleep(20)
+    advance(0.02)
 
     cache.cleanup()
     check cache.len == 0
@@ -214,7 +227,7 @@ suite "Frame Cache":
     check cache.len == 0
 
   test "frame cache expires quickly":
-    var cache = initFrameCache[int, int]()
+    var cache = initFrameCache[int, int](clock = fakeClock)
     var computeCount = 0
 
     discard cache.get(1, proc(): int =
@@ -222,7 +235,7 @@ suite "Frame Cache":
       42
     )
 
-    sleep(30)  # 30ms > FrameCacheMaxAge (20ms)
+    advance(0.03)  # 30ms > FrameCacheMaxAge (20ms)
 
     let result = cache.get(1, proc(): int =
       computeCount += 1
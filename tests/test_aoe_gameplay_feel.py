@@ -121,10 +121,8 @@ def gameplay_run():
     snapshots[0] = _collect_snapshot(env)
 
     for step in range(1, 2001):
-        actions = {
-            f"agent_{i}": int(rng.randint(0, ACTION_SPACE_SIZE))
-            for i in range(num_agents)
-        }
+        # One vectorized draw per step yields the same stream as per-agent draws
+        actions = rng.randint(0, ACTION_SPACE_SIZE, size=num_agents)
         env.step(actions)
         if step in capture_steps:
             snapshots[step] = _collect_snapshot(env)
@@ -313,10 +311,7 @@ class TestPerformance:
         rng = np.random.RandomState(123)
         t0 = time.monotonic()
         for _ in range(100):
-            actions = {
-                f"agent_{i}": int(rng.randint(0, ACTION_SPACE_SIZE))
-                for i in range(perf_env.total_agents)
-            }
+            actions = rng.randint(0, ACTION_SPACE_SIZE, size=perf_env.total_agents)
             perf_env.step(actions)
         elapsed = time.monotonic() - t0
         sps = 100 / elapsed
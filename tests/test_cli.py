@@ -83,6 +83,16 @@ class TestPlayDispatch:
         assert result.exit_code == 0
         assert ansi_calls == ["lib", "ansi"]
 
+    def test_play_ansi_forwards_render_every(self, monkeypatch):
+        ansi_kwargs: list[dict] = []
+
+        monkeypatch.setattr(cli, "ensure_nim_library_current", lambda: None)
+        monkeypatch.setattr(cli, "_run_ansi", lambda **kwargs: ansi_kwargs.append(kwargs))
+
+        result = runner.invoke(app, ["play", "--render", "ansi", "--render-every", "8"])
+        assert result.exit_code == 0
+        assert ansi_kwargs[0]["render_every"] == 8
+
 
 class TestGuiLaunchStrategy:
     """Verify the GUI launcher uses the fast path when possible."""
@@ -116,10 +126,17 @@ class TestGuiLaunchStrategy:
 
         assert calls == [([str(binary_path)], runtime_root)]
 
-    def test_run_gui_uses_nim_when_instrumented(self, monkeypatch):
+    def test_run_gui_uses_cached_instrumented_binary(self, monkeypatch):
         runtime_root = Path("/tmp/tribal_village_runtime")
+        binary_path = runtime_root / "tribal_village-instrumented"
         calls: list[tuple[list[str], Path | None]] = []
+        requested_flags: list[list[str]] = []
+
+        def fake_ensure_binary(extra_flags=()):
+            requested_flags.append(list(extra_flags))
+            return binary_path
 
+        monkeypatch.setattr(cli, "ensure_nim_binary_current", fake_ensure_binary)
         monkeypatch.setattr(cli, "get_runtime_project_root", lambda: runtime_root)
         monkeypatch.setattr(
             cli.subprocess,
@@ -141,12 +158,8 @@ class TestGuiLaunchStrategy:
             render_timing_exit=None,
         )
 
-        assert calls == [
-            (
-                ["nim", "r", "-d:release", "-d:stepTiming", "--path:src", "tribal_village.nim"],
-                runtime_root,
-            )
-        ]
+        assert requested_flags == [["-d:stepTiming"]]
+        assert calls == [([str(binary_path)], runtime_root)]
 
 
 @requires_nim_library
@@ -3,6 +3,7 @@
 import math
 
 import pytest
+from pydantic import ConfigDict, ValidationError
 
 from tribal_village_env.config import (
     EnvironmentConfig,
@@ -46,16 +47,62 @@ class TestConfig:
         assert env.render_scale == 2
         assert env.rewards.heart == 1.5
 
+    def test_update_validates_and_rejects_unknown_keys(self):
+        """Batch updates validate values and report bad keys like override."""
+        env = EnvironmentConfig()
+        env.update({"rewards.heart": "2.5"})
+        assert env.rewards.heart == 2.5
+        with pytest.raises(ValueError):
+            env.update({"max_steps": "not a number"})
+        with pytest.raises(ValueError, match="not found"):
+            env.update({"rewards.invalid_field": 1.0})
+
+    def test_update_and_override_mark_the_same_fields_set(self):
+        """The compiled update() setters record set fields like override()."""
+        updates = {"max_steps": 3000, "rewards.heart": 1.5}
+        updated = EnvironmentConfig().update(updates)
+        overridden = EnvironmentConfig()
+        for key, value in updates.items():
+            overridden.override(key, value)
+
+        assert updated.model_fields_set == overridden.model_fields_set
+        assert updated.rewards.model_fields_set == overridden.rewards.model_fields_set
+
+    def test_update_respects_frozen_and_validate_assignment(self):
+        """Classes that customize assignment go through BaseModel.__setattr__."""
+
+        class FrozenRewards(RewardConfig):
+            model_config = ConfigDict(extra="forbid", frozen=True)
+
+        class CheckedRewards(RewardConfig):
+            model_config = ConfigDict(extra="forbid", validate_assignment=True)
+
+        with pytest.raises(ValidationError, match="frozen"):
+            FrozenRewards().update({"heart": 1.0})
+
+        checked = CheckedRewards().update({"heart": 1.0})
+        assert checked.heart == 1.0
+        assert checked.model_fields_set == {"heart"}
+
 
 class TestRewardConfig:
     """Tests for RewardConfig."""
 
-    def test_defaults_are_nan(self):
-        """Test that default reward values are NaN."""
+    def test_defaults_are_none(self):
+        """Test that default reward values are unset (None)."""
         rewards = RewardConfig()
-        assert math.isnan(rewards.heart)
-        assert math.isnan(rewards.ore)
-        assert math.isnan(rewards.death_penalty)
+        assert rewards.heart is None
+        assert rewards.ore is None
+        assert rewards.death_penalty is None
+
+    def test_legacy_nan_means_unset(self):
+        """NaN in a legacy dict still means "use the engine default"."""
+        env = EnvironmentConfig.from_legacy_dict(
+            {"heart_reward": math.nan, "tumor_spawn_rate": math.nan}
+        )
+        assert env.rewards.heart is None
+        assert env.tumor_spawn_rate is None
+        assert "heart_reward" not in env.to_legacy_dict()
 
     def test_set_reward_value(self):
         """Test setting a reward value."""
@@ -81,9 +128,12 @@ class TestEnvironmentConfig:
         assert env.render_mode == "ansi"
 
     def test_render_mode_validation(self):
-        """Test that invalid render mode raises ValueError."""
-        with pytest.raises(ValueError, match="render_mode must be one of"):
+        """Test that invalid render mode raises ValidationError."""
+        with pytest.raises(ValidationError, match="render_mode") as exc_info:
             EnvironmentConfig(render_mode="invalid")
+        error = exc_info.value.errors()[0]
+        assert error["loc"] == ("render_mode",)
+        assert error["type"] == "literal_error"
 
     def test_to_legacy_dict(self):
         """Test conversion to legacy dictionary format."""
@@ -144,6 +144,23 @@ class TestTribalVillageEnvIntegration:
 
         env.close()
 
+    def test_env_step_infos_are_not_shared(self):
+        """Writing into one step's infos must not leak into the next."""
+        from tribal_village_env.environment import TribalVillageEnv
+
+        env = TribalVillageEnv()
+        env.reset()
+
+        actions = {f"agent_{i}": 0 for i in range(env.num_agents)}
+        infos = env.step(actions)[4]
+        infos["agent_0"] = {"seen": True}
+        with pytest.raises(TypeError):
+            infos["agent_1"]["seen"] = True
+
+        assert env.step(actions)[4]["agent_0"] == {}
+
+        env.close()
+
     def test_env_multiple_steps(self):
         """Environment should handle multiple steps."""
         from tribal_village_env.environment import TribalVillageEnv
@@ -5,7 +5,6 @@ Tests the TribalVillageEnv class and all FFI functions.
 Run with: pytest tests/test_python_integration.py -v
 """
 
-import ctypes
 import numpy as np
 import pytest
 
@@ -17,6 +16,8 @@ from tribal_village_env.config import (
     OBS_NORMALIZATION_FACTOR,
 )
 from tribal_village_env.environment import (
+    _NIMCONFIG_FIELD_NAMES,
+    _NIMCONFIG_SIZE,
     TribalVillageEnv,
     NimConfig,
     make_tribal_village_env,
@@ -46,7 +47,7 @@ class TestNimConfigStruct:
 
     def test_nimconfig_field_order(self):
         """Verify NimConfig fields are in correct order for FFI alignment."""
-        fields = [name for name, _ in NimConfig._fields_]
+        fields = list(_NIMCONFIG_FIELD_NAMES)
         expected = [
             "max_steps",
             "victory_condition",
@@ -86,20 +87,25 @@ class TestNimConfigStruct:
         """Verify NimConfig struct size is consistent."""
         # 2 int32s + 14 floats = 2*4 + 14*4 = 64 bytes
         expected_size = 64
-        actual_size = ctypes.sizeof(NimConfig)
+        actual_size = _NIMCONFIG_SIZE
         assert actual_size == expected_size, f"Size mismatch: {actual_size} != {expected_size}"
 
 
 class TestEnvironmentCreation:
     """Test environment creation and configuration."""
 
-    def test_create_default_env(self):
-        """Create environment with default config."""
+    @pytest.fixture(scope="class")
+    def shared_env(self):
+        """One default environment shared by the read-only checks below."""
         env = TribalVillageEnv()
-        assert env is not None
-        assert env.env_ptr is not None
+        yield env
         env.close()
 
+    def test_create_default_env(self, shared_env):
+        """Create environment with default config."""
+        assert shared_env is not None
+        assert shared_env.env_ptr is not None
+
     def test_create_with_config(self):
         """Create environment with custom config."""
         config = {
@@ -117,29 +123,32 @@ class TestEnvironmentCreation:
         assert env.max_steps == 1000
         env.close()
 
-    def test_env_dimensions(self):
-        """Verify environment dimensions are sensible."""
-        env = TribalVillageEnv()
-        assert env.total_agents > 0
-        assert env.obs_layers > 0
-        assert env.obs_width > 0
-        assert env.obs_height > 0
-        assert env.num_agents == env.total_agents
+    def test_make_factory_leaves_config_untouched(self):
+        """Keyword overrides should not be written back into the caller's dict."""
+        config = {"max_steps": 500}
+        env = make_tribal_village_env(config, heart_reward=2.0)
+        assert config == {"max_steps": 500}
+        assert env.max_steps == 500
+        assert env.config["heart_reward"] == 2.0
         env.close()
 
-    def test_action_space(self):
+    def test_env_dimensions(self, shared_env):
+        """Verify environment dimensions are sensible."""
+        assert shared_env.total_agents > 0
+        assert shared_env.obs_layers > 0
+        assert shared_env.obs_width > 0
+        assert shared_env.obs_height > 0
+        assert shared_env.num_agents == shared_env.total_agents
+
+    def test_action_space(self, shared_env):
         """Verify action space is correctly configured."""
-        env = TribalVillageEnv()
-        assert env.single_action_space.n == ACTION_SPACE_SIZE
+        assert shared_env.single_action_space.n == ACTION_SPACE_SIZE
         assert ACTION_SPACE_SIZE == ACTION_VERB_COUNT * ACTION_ARGUMENT_COUNT
-        env.close()
 
-    def test_observation_space(self):
+    def test_observation_space(self, shared_env):
         """Verify observation space matches dimensions."""
-        env = TribalVillageEnv()
-        obs_shape = env.single_observation_space.shape
-        assert obs_shape == (env.obs_layers, env.obs_width, env.obs_height)
-        env.close()
+        obs_shape = shared_env.single_observation_space.shape
+        assert obs_shape == (shared_env.obs_layers, shared_env.obs_width, shared_env.obs_height)
 
 
 class TestEnvironmentLifecycle:
@@ -215,6 +224,66 @@ class TestEnvironmentLifecycle:
             # Verify step completed without error
             assert env.step_count == step + 1
 
+    def test_array_returns(self, env):
+        """as_dict=False returns the shared buffers instead of per-agent dicts."""
+        obs, info = env.reset(as_dict=False)
+        assert obs is env.observations
+        assert info == {}
+
+        actions = np.zeros(env.num_agents, dtype=np.int32)
+        obs, rewards, terminated, truncated, info = env.step(actions, as_dict=False)
+        assert obs.shape == (env.num_agents, *env.single_observation_space.shape)
+        assert rewards is env.rewards
+        assert terminated is env.terminals
+        assert truncated is env.truncations
+
+        # Array actions default to array returns with an empty info dict
+        obs, rewards, terminated, truncated, info = env.step(actions)
+        assert rewards is env.rewards
+        assert info == {}
+
+    def test_buffer_backed_reset_returns_arrays(self, env):
+        """Envs built on PufferLib buffers reset to arrays with empty infos."""
+        buf = dict(
+            observations=env.observations,
+            rewards=env.rewards,
+            terminals=env.terminals,
+            truncations=env.truncations,
+            teacher_actions=env.teacher_actions,
+            masks=env.masks,
+            actions=env.actions,
+        )
+        env.close()
+
+        buffered = TribalVillageEnv(buf=buf)
+        try:
+            obs, info = buffered.reset()
+            assert obs is buf["observations"]
+            assert info == {}
+        finally:
+            buffered.close()
+
+    def test_run_fixed_action(self, env):
+        """run_fixed_action advances the env without per-step Python results."""
+        env.reset()
+        total_rewards = env.run_fixed_action(25)
+
+        assert env.step_count == 25
+        assert total_rewards.shape == (env.num_agents,)
+
+    def test_step_batch(self, env):
+        """step_batch runs several steps in one call and stacks the results."""
+        env.reset()
+        actions = np.zeros((10, env.num_agents), dtype=np.int32)
+
+        obs, rewards, terminals, truncations = env.step_batch(actions)
+
+        assert env.step_count == 10
+        assert obs.shape == (10, env.num_agents, *env.single_observation_space.shape)
+        assert rewards.shape == (10, env.num_agents)
+        assert terminals.shape == truncations.shape == (10, env.num_agents)
+        np.testing.assert_array_equal(env.observations, obs[-1])
+
 
 class TestRenderModes:
     """Test render functionality."""
@@ -234,7 +303,7 @@ class TestRenderModes:
     def test_render_rgb_array(self, env):
         """Test RGB array rendering."""
         env.reset()
-        env.step({f"agent_{i}": 0 for i in range(env.num_agents)})
+        env.step(np.zeros(env.num_agents, dtype=np.int32))
 
         result = env.render()
         if result is not None and isinstance(result, np.ndarray):
@@ -246,7 +315,7 @@ class TestRenderModes:
         """Test ANSI text rendering."""
         env = TribalVillageEnv(config={"render_mode": "ansi"})
         env.reset()
-        env.step({f"agent_{i}": 0 for i in range(env.num_agents)})
+        env.step(np.zeros(env.num_agents, dtype=np.int32))
 
         result = env.render()
         # Should return a string (or empty string if not available)
@@ -262,7 +331,7 @@ class TestFogOfWarQueries:
         env = TribalVillageEnv()
         env.reset()
         # Run a few steps so some tiles may be revealed
-        actions = {f"agent_{i}": 0 for i in range(env.num_agents)}
+        actions = np.zeros(env.num_agents, dtype=np.int32)
         for _ in range(10):
             env.step(actions)
         yield env
@@ -328,7 +397,7 @@ class TestThreatMapQueries:
         env = TribalVillageEnv()
         env.reset()
         # Run some steps to potentially create threats
-        actions = {f"agent_{i}": 0 for i in range(env.num_agents)}
+        actions = np.zeros(env.num_agents, dtype=np.int32)
         for _ in range(50):
             env.step(actions)
         yield env
@@ -371,25 +440,20 @@ class TestEndToEndScenarios:
         config = {"max_steps": 100}
         env = TribalVillageEnv(config=config)
 
-        obs, info = env.reset()
-        total_reward = {f"agent_{i}": 0.0 for i in range(env.num_agents)}
+        obs, info = env.reset(as_dict=False)
+        total_reward = np.zeros(env.num_agents, dtype=np.float32)
         done = False
         steps = 0
 
         while not done and steps < 100:
-            actions = {
-                f"agent_{i}": np.random.randint(0, ACTION_SPACE_SIZE)
-                for i in range(env.num_agents)
-            }
-            obs, rewards, terminated, truncated, info = env.step(actions)
+            actions = env.sample_actions()
+            obs, rewards, terminated, truncated, info = env.step(actions, as_dict=False)
 
-            for agent_id, reward in rewards.items():
-                total_reward[agent_id] += reward
+            # Results are indexed by agent number, no "agent_{i}" keys
+            total_reward += rewards
 
             # Check if all agents are done
-            all_terminated = all(terminated.values())
-            all_truncated = all(truncated.values())
-            done = all_terminated or all_truncated
+            done = terminated.all() or truncated.all()
             steps += 1
 
         env.close()
@@ -434,7 +498,7 @@ class TestEndToEndScenarios:
         """Environment should clean up resources on close."""
         env = TribalVillageEnv()
         env.reset()
-        env.step({f"agent_{i}": 0 for i in range(env.num_agents)})
+        env.step(np.zeros(env.num_agents, dtype=np.int32))
 
         # Store pointer before close
         ptr = env.env_ptr
@@ -447,9 +511,9 @@ class TestEndToEndScenarios:
         """Rapid reset cycles should not leak memory."""
         env = TribalVillageEnv()
 
+        actions = np.zeros(env.num_agents, dtype=np.int32)
         for _ in range(20):
             env.reset()
-            actions = {f"agent_{i}": 0 for i in range(env.num_agents)}
             for _ in range(5):
                 env.step(actions)
 
@@ -468,6 +532,12 @@ class TestEndToEndScenarios:
         actions_max = {f"agent_{i}": ACTION_SPACE_SIZE - 1 for i in range(env.num_agents)}
         env.step(actions_max)
 
+        # Array actions, with out-of-range values clamped to noop
+        actions_array = np.full(env.num_agents, ACTION_SPACE_SIZE, dtype=np.int32)
+        actions_array[0] = -1
+        env.step(actions_array)
+        assert not env.actions_buffer.any()
+
         env.close()
 
 
@@ -0,0 +1,82 @@
+"""Tests for the training vecenv wiring."""
+
+import pytest
+
+from tests.conftest import requires_nim_library
+
+
+def _trainer_config(batch_size: int, data_dir: str) -> dict:
+    return dict(
+        env="tribal_village",
+        data_dir=data_dir,
+        seed=0,
+        torch_deterministic=True,
+        device="cpu",
+        cpu_offload=False,
+        use_rnn=False,
+        compile=False,
+        precision="float32",
+        batch_size=batch_size,
+        bptt_horizon=1,
+        minibatch_size=batch_size,
+        max_minibatch_size=batch_size,
+        total_timesteps=batch_size,
+        update_epochs=1,
+        optimizer="adam",
+        learning_rate=1e-3,
+        adam_beta1=0.9,
+        adam_beta2=0.999,
+        adam_eps=1e-8,
+    )
+
+
+@requires_nim_library
+def test_half_batch_vecenv_runs_an_evaluate_step(tmp_path):
+    pytest.importorskip("cogames")
+    pytest.importorskip("mettagrid")
+    torch = pytest.importorskip("torch")
+    from pufferlib import pufferl
+    from pufferlib import vector as pvector
+
+    from tribal_village_env.cogames.train import _make_vecenv
+
+    class TinyPolicy(torch.nn.Module):
+        def __init__(self, obs_size: int, num_actions: int):
+            super().__init__()
+            self.actor = torch.nn.Linear(obs_size, num_actions)
+            self.critic = torch.nn.Linear(obs_size, 1)
+
+        def forward_eval(self, obs, state):
+            hidden = obs.flatten(1).float()
+            return self.actor(hidden), self.critic(hidden)
+
+    vecenv = _make_vecenv(
+        {"max_steps": 16, "render_mode": "ansi"},
+        num_envs=2,
+        num_workers=2,
+        batch_size=1,
+        backend=pvector.Multiprocessing,
+        overwork=True,
+    )
+    trainer = None
+    try:
+        # Each recv returns one env's agents; the trainer is sized for both
+        assert vecenv.num_agents == 2 * vecenv.agents_per_batch
+
+        obs_space = vecenv.single_observation_space
+        policy = TinyPolicy(
+            int(torch.tensor(obs_space.shape).prod()), vecenv.single_action_space.n
+        )
+        trainer = pufferl.PuffeRL(
+            _trainer_config(vecenv.num_agents, str(tmp_path)), vecenv, policy
+        )
+        trainer.evaluate()
+
+        assert trainer.global_step == vecenv.num_agents
+        assert trainer.full_rows == vecenv.num_agents
+    finally:
+        # PuffeRL.close() also stops its utilization thread and closes vecenv
+        if trainer is not None:
+            trainer.close()
+        else:
+            vecenv.close()
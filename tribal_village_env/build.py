@@ -1,14 +1,14 @@
 from __future__ import annotations
 
+import hashlib
 import os
 import platform
 import shutil
 import stat
 import subprocess
-import tempfile
-import urllib.request
+from functools import partial
 from pathlib import Path
-from typing import Callable, Iterable
+from typing import Callable, Iterable, Sequence
 
 DEFAULT_NIM_VERSION = os.environ.get("TRIBAL_VILLAGE_NIM_VERSION", "2.2.6")
 DEFAULT_NIMBY_VERSION = os.environ.get("TRIBAL_VILLAGE_NIMBY_VERSION", "0.1.11")
@@ -80,25 +80,40 @@ def _build_library(project_root: Path) -> Path:
     )
 
 
-def _build_binary(project_root: Path) -> Path:
+def _binary_name(extra_flags: Sequence[str]) -> str:
+    """Binary file name for a set of extra compile flags.
+
+    Instrumented builds (profiler, timing defines) get their own suffixed
+    binary so switching flags never invalidates the plain launcher.
+    """
+    if not extra_flags:
+        return _TARGET_BINARY_NAME
+    digest = hashlib.sha1(" ".join(extra_flags).encode()).hexdigest()[:8]
+    stem, dot, ext = _TARGET_BINARY_NAME.partition(".")
+    return f"{stem}-{digest}{dot}{ext}"
+
+
+def _build_binary(project_root: Path, extra_flags: Sequence[str] = ()) -> Path:
+    binary_name = _binary_name(extra_flags)
     _run_build(
         project_root,
         [
             "nim",
             "c",
             "-d:release",
+            *extra_flags,
             "--path:src",
-            f"--out:{_TARGET_BINARY_NAME}",
+            f"--out:{binary_name}",
             "tribal_village.nim",
         ],
         "Tribal Village binary",
     )
 
-    binary_path = project_root / _TARGET_BINARY_NAME
+    binary_path = project_root / binary_name
     if binary_path.exists():
         return binary_path
 
-    raise RuntimeError(f"Build completed but {_TARGET_BINARY_NAME} was not found.")
+    raise RuntimeError(f"Build completed but {binary_name} was not found.")
 
 
 def _needs_rebuild(target_path: Path, source_files: Iterable[Path]) -> bool:
@@ -151,13 +166,19 @@ def ensure_nim_library_current(verbose: bool = True) -> Path:
     )
 
 
-def ensure_nim_binary_current(verbose: bool = True) -> Path:
-    """Rebuild the GUI binary if missing or stale."""
+def ensure_nim_binary_current(
+    verbose: bool = True, extra_flags: Sequence[str] = ()
+) -> Path:
+    """Rebuild the GUI binary if missing or stale.
+
+    ``extra_flags`` are passed to ``nim c``; each distinct set is cached as
+    its own binary next to the default one.
+    """
     project_root = get_runtime_project_root()
     return _ensure_current(
-        project_root / _TARGET_BINARY_NAME,
+        project_root / _binary_name(extra_flags),
         project_root,
-        _build_binary,
+        partial(_build_binary, extra_flags=tuple(extra_flags)),
         "Building Tribal Village GUI binary to keep the launcher current...",
         verbose=verbose,
     )
@@ -179,6 +200,10 @@ def _ensure_nim_toolchain() -> None:
         else:
             raise RuntimeError(f"Unsupported OS for nimby bootstrap: {system}")
 
+        # Only needed on first-time bootstrap; keep them off the CLI import path
+        import tempfile
+        import urllib.request
+
         dst = Path.home() / ".nimby" / "nim" / "bin" / "nimby"
         with tempfile.TemporaryDirectory() as tmp:
             nimby_dl = Path(tmp) / "nimby"
@@ -1,5 +1,3 @@
-from __future__ import annotations
-
 import os
 import subprocess
 from typing import Annotated
@@ -40,6 +38,7 @@ if attach_train_command is not None:
 Render = Annotated[str, typer.Option("--render", "-r", help="Render mode: gui (default) or ansi (text-only)")]
 Steps = Annotated[int, typer.Option("--steps", "-s", help="Steps to run when using ANSI render", min=1)]
 MaxSteps = Annotated[int | None, typer.Option("--max-steps", help="Override max steps in ANSI mode", min=1)]
+RenderEvery = Annotated[int, typer.Option("--render-every", help="Render every N steps in ANSI mode (0 = final frame only)", min=0)]
 RandomActions = Annotated[bool, typer.Option("--random-actions/--no-random-actions", help="Use random actions in ANSI mode (otherwise no-op)")]
 Profile = Annotated[bool, typer.Option("--profile", help="Enable Nim profiler (GUI mode only; runs headless steps then exits)")]
 ProfileSteps = Annotated[int, typer.Option("--profile-steps", help="Steps to run when profiling", min=1)]
@@ -80,15 +79,16 @@ def _run_gui(
             env["TV_RENDER_TIMING_EXIT"] = str(render_timing_exit)
 
     if profile or step_timing or render_timing:
-        cmd = ["nim", "r", "-d:release"]
+        flags: list[str] = []
         if profile:
-            cmd.extend(["--profiler:on", "--stackTrace:on", "--lineTrace:on"])
+            flags.extend(["--profiler:on", "--stackTrace:on", "--lineTrace:on"])
         if step_timing:
-            cmd.append("-d:stepTiming")
+            flags.append("-d:stepTiming")
         if render_timing:
-            cmd.append("-d:renderTiming")
-        cmd.extend(["--path:src", "tribal_village.nim"])
-        console.print("[cyan]Launching Tribal Village GUI via Nim...[/cyan]")
+            flags.append("-d:renderTiming")
+        # Instrumented builds are cached per flag set, so warm runs skip nim c
+        cmd = [str(ensure_nim_binary_current(extra_flags=flags))]
+        console.print("[cyan]Launching instrumented Tribal Village GUI...[/cyan]")
     else:
         cmd = [str(ensure_nim_binary_current())]
         console.print("[cyan]Launching Tribal Village GUI...[/cyan]")
@@ -96,7 +96,11 @@ def _run_gui(
     subprocess.run(cmd, cwd=project_root, check=True, env=env)
 
 
-def _run_ansi(steps: int, max_steps: int | None, random_actions: bool) -> None:
+def _run_ansi(
+    steps: int, max_steps: int | None, random_actions: bool, render_every: int = 1
+) -> None:
+    import numpy as np
+
     from tribal_village_env.environment import TribalVillageEnv
 
     config: dict[str, object] = {"render_mode": "ansi"}
@@ -104,22 +108,21 @@ def _run_ansi(steps: int, max_steps: int | None, random_actions: bool) -> None:
         config["max_steps"] = max_steps
 
     env = TribalVillageEnv(config=config)
+    noop_actions = np.zeros(env.num_agents, dtype=np.int32)
 
     try:
-        env.reset()
+        env.reset(as_dict=False)
         console.print(env.render())
 
         for step in range(steps):
-            actions = {
-                f"agent_{agent_id}": (
-                    int(env.single_action_space.sample()) if random_actions else 0
-                )
-                for agent_id in range(env.num_agents)
-            }
-            _, _, terminated, truncated, _ = env.step(actions)
-            console.print(env.render())
-
-            if all(terminated.values()) or all(truncated.values()):
+            actions = env.sample_actions() if random_actions else noop_actions
+            _, _, terminated, truncated, _ = env.step(actions, as_dict=False)
+            done = terminated.all() or truncated.all()
+            last_step = done or step + 1 == steps
+            if last_step or (render_every and (step + 1) % render_every == 0):
+                console.print(env.render())
+
+            if done:
                 console.print(f"[yellow]Episode ended at step {step + 1}[/yellow]")
                 break
     finally:
@@ -131,6 +134,7 @@ def play(
     render: Render = "gui",
     steps: Steps = DEFAULT_ANSI_STEPS,
     max_steps: MaxSteps = None,
+    render_every: RenderEvery = 1,
     random_actions: RandomActions = True,
     profile: Profile = False,
     profile_steps: ProfileSteps = DEFAULT_PROFILE_STEPS,
@@ -163,7 +167,12 @@ def play(
         )
     else:
         ensure_nim_library_current()
-        _run_ansi(steps=steps, max_steps=max_steps, random_actions=random_actions)
+        _run_ansi(
+            steps=steps,
+            max_steps=max_steps,
+            random_actions=random_actions,
+            render_every=render_every,
+        )
 
 
 @app.callback(invoke_without_command=True)
@@ -172,6 +181,7 @@ def root(
     render: Render = "gui",
     steps: Steps = DEFAULT_ANSI_STEPS,
     max_steps: MaxSteps = None,
+    render_every: RenderEvery = 1,
     random_actions: RandomActions = True,
     profile: Profile = False,
     profile_steps: ProfileSteps = DEFAULT_PROFILE_STEPS,
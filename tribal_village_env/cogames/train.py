@@ -6,7 +6,8 @@ import logging
 import multiprocessing
 import os
 import platform
-from typing import Any
+from pathlib import Path
+from typing import Any, NamedTuple
 
 import numpy as np
 import psutil
@@ -18,7 +19,6 @@ from mettagrid.policy.loader import get_policy_class_shorthand, initialize_or_lo
 from mettagrid.policy.policy import PolicySpec
 from pufferlib import pufferl
 from pufferlib import vector as pvector
-from pufferlib.pufferlib import set_buffers
 from tribal_village_env.cogames.policy import TribalPolicyEnvInfo
 from tribal_village_env.config import (
     DEFAULT_ADAM_BETA1,
@@ -43,6 +43,7 @@ from tribal_village_env.config import (
     DEFAULT_VTRACE_C_CLIP,
     DEFAULT_VTRACE_RHO_CLIP,
 )
+from tribal_village_env.environment import TribalVillageEnv
 
 logger = logging.getLogger("cogames.tribal_village.train")
 _MISSING = object()
@@ -66,8 +67,132 @@ def _getattr_fallback(obj: Any, *names: str, default: Any = None) -> Any:
     return default
 
 
+def _as_shape(arr: Any, shape: tuple[int, ...]) -> np.ndarray:
+    """Return *arr* as an ndarray of *shape*, skipping reshape when it already matches."""
+    if not isinstance(arr, np.ndarray):
+        arr = np.asarray(arr)
+    return arr if arr.shape == shape else arr.reshape(shape)
+
+
+def _parse_cpulist(text: str) -> list[int]:
+    """Parse a sysfs cpulist such as ``0-3,8-11`` into CPU ids."""
+    cpus: list[int] = []
+    for part in text.strip().split(","):
+        if not part:
+            continue
+        lo, _, hi = part.partition("-")
+        cpus.extend(range(int(lo), int(hi or lo) + 1))
+    return cpus
+
+
+def _numa_node_cpus(allowed: list[int]) -> list[list[int]]:
+    """Allowed CPU ids per NUMA node, or an empty list when not multi-socket."""
+    allowed_set = set(allowed)
+    node_root = Path("/sys/devices/system/node")
+    nodes = []
+    for node_dir in sorted(node_root.glob("node[0-9]*"), key=lambda p: int(p.name[4:])):
+        try:
+            cpus = _parse_cpulist((node_dir / "cpulist").read_text())
+        except (OSError, ValueError):
+            continue
+        cpus = [cpu for cpu in cpus if cpu in allowed_set]
+        if cpus:
+            nodes.append(cpus)
+    return nodes if len(nodes) > 1 else []
+
+
+def _one_cpu_per_core(allowed: list[int]) -> list[int]:
+    """First allowed logical CPU of each physical core, in CPU order.
+
+    Falls back to every allowed CPU when the sysfs topology is unreadable.
+    """
+    cpu_root = Path("/sys/devices/system/cpu")
+    picked: list[int] = []
+    seen: set[int] = set()
+    for cpu in sorted(allowed):
+        if cpu in seen:
+            continue
+        try:
+            siblings = _parse_cpulist(
+                (cpu_root / f"cpu{cpu}" / "topology" / "thread_siblings_list").read_text()
+            )
+        except (OSError, ValueError):
+            return sorted(allowed)
+        seen.update(siblings)
+        picked.append(cpu)
+    return picked
+
+
+def _pin_worker_affinity(vecenv: Any, reserved_cores: int = 0) -> None:
+    """Give each vecenv worker its own physical core (Linux only).
+
+    Forked workers inherit the parent's affinity mask, which can leave every
+    worker contending for the same one or two cores. CPUs are taken from
+    that inherited mask (so taskset/cgroup/Slurm limits are respected), one
+    per physical core; the first ``reserved_cores`` go to the driver/learner
+    process and the workers share the rest round-robin. Only the worker
+    processes the backend reports are pinned.
+    """
+    if platform.system() != "Linux":
+        return
+
+    pids = [
+        proc.pid
+        for proc in _getattr_fallback(vecenv, "processes", default=None) or ()
+        if getattr(proc, "pid", None)
+    ]
+    if not pids:
+        return
+
+    try:
+        driver = psutil.Process()
+        allowed = driver.cpu_affinity()
+    except (psutil.Error, OSError, AttributeError) as exc:
+        logger.debug("Could not read CPU affinity: %s", exc)
+        return
+
+    cores = _one_cpu_per_core(allowed)
+    reserved_cores = max(0, min(reserved_cores, len(cores) - 1))
+    if reserved_cores > 0:
+        try:
+            driver.cpu_affinity(cores[:reserved_cores])
+        except (psutil.Error, OSError, ValueError) as exc:
+            logger.debug("Could not set driver CPU affinity: %s", exc)
+            return
+
+    # Opt-in: keep each worker (and so its first-touched obs buffers) on one
+    # NUMA node instead of pinning it to a single core
+    numa_nodes = (
+        _numa_node_cpus([cpu for cpu in allowed if cpu not in cores[:reserved_cores]])
+        if os.environ.get("TRIBAL_ENABLE_NUMA") == "1"
+        else []
+    )
+    if numa_nodes:
+        for i, pid in enumerate(pids):
+            node = i % len(numa_nodes)
+            try:
+                psutil.Process(pid).cpu_affinity(numa_nodes[node])
+            except (psutil.Error, OSError, ValueError) as exc:
+                logger.debug("Could not bind worker %s to NUMA node %s: %s", pid, node, exc)
+        return
+
+    worker_cores = cores[reserved_cores:]
+    for i, pid in enumerate(pids):
+        cpu = worker_cores[i % len(worker_cores)]
+        try:
+            psutil.Process(pid).cpu_affinity([cpu])
+        except (psutil.Error, OSError, ValueError) as exc:
+            logger.debug("Could not pin worker %s to CPU %s: %s", pid, cpu, exc)
+
+
 class TribalEnvFactory:
-    """Picklable factory for vectorized Tribal Village environments."""
+    """Picklable factory for vectorized Tribal Village environments.
+
+    Under the multiprocessing backend ``buf`` holds this env's slice of
+    PufferLib's shared-memory buffers; the env binds to it so the Nim step
+    writes observations straight into shared memory, and its resets return
+    no per-agent infos for the workers to pipe.
+    """
 
     def __init__(self, base_config: dict[str, Any]):
         self._base_config = dict(base_config)
@@ -78,17 +203,26 @@ class TribalEnvFactory:
         buf: Any | None = None,
         seed: int | None = None,
     ) -> Any:
-        from tribal_village_env.environment import TribalVillageEnv
-
         merged_cfg = dict(self._base_config)
         if cfg is not None:
             merged_cfg.update(cfg)
         if seed is not None and "seed" not in merged_cfg:
             merged_cfg["seed"] = seed
 
-        env = TribalVillageEnv(config=merged_cfg)
-        set_buffers(env, buf)
-        return env
+        return TribalVillageEnv(config=merged_cfg, buf=buf)
+
+
+class StepResult(NamedTuple):
+    """One flattened vecenv batch, in PufferLib's 8-item recv order."""
+
+    obs: Any
+    reward: np.ndarray
+    done: np.ndarray
+    truncated: np.ndarray
+    teacher_actions: Any
+    infos: list
+    env_ids: np.ndarray
+    mask: np.ndarray
 
 
 class FlattenVecEnv:
@@ -96,20 +230,40 @@ class FlattenVecEnv:
 
     def __init__(self, inner: Any):
         self.inner = inner
-        self.driver_env = _getattr_fallback(inner, "driver_env")
-        for attr in (
-            "single_observation_space",
-            "single_action_space",
-            "action_space",
-            "observation_space",
-            "atn_batch_shape",
-        ):
-            setattr(self, attr, _getattr_fallback(inner, attr))
+        try:
+            self.driver_env = inner.driver_env
+        except AttributeError:
+            raise RuntimeError(
+                "Vectorized environment did not expose driver_env for shape inference."
+            ) from None
+        self.single_observation_space = _getattr_fallback(inner, "single_observation_space")
+        self.single_action_space = _getattr_fallback(inner, "single_action_space")
+        if self.single_observation_space is None or self.single_action_space is None:
+            raise RuntimeError(
+                "Vectorized environment must expose single_observation_space and single_action_space."
+            )
+        self.action_space = _getattr_fallback(inner, "action_space")
+        self.observation_space = _getattr_fallback(inner, "observation_space")
+        self.atn_batch_shape = _getattr_fallback(inner, "atn_batch_shape")
 
         self.agents_per_batch = _getattr_fallback(inner, "agents_per_batch", "num_agents", default=1)
-        self.num_agents = self.agents_per_batch
+        # Agents across all envs, not one recv batch: PuffeRL sizes its
+        # per-agent buffers from num_agents and indexes them by env_ids.
+        self.num_agents = _getattr_fallback(inner, "num_agents", default=self.agents_per_batch)
         self.num_envs = _getattr_fallback(inner, "num_envs", "num_environments")
 
+        # Spaces are fixed for the run; resolve shape/dtype once, not per recv
+        self._obs_shape = (self.agents_per_batch, *tuple(self.single_observation_space.shape))
+        self._obs_dtype = self.single_observation_space.dtype
+        self._flat_shape = (self.agents_per_batch,)
+        # Returned as-is whenever the vecenv omits masks/env_ids; the trainer
+        # must treat them as read-only.
+        self._default_mask = np.ones(self._flat_shape, dtype=bool)
+        self._default_env_ids = np.arange(self.agents_per_batch, dtype=np.int32)
+        self._default_mask.flags.writeable = False
+        self._default_env_ids.flags.writeable = False
+        self._atn_dtype = self.single_action_space.dtype
+
     def async_reset(self, seed: int = 0) -> None:
         self.inner.async_reset(seed)
 
@@ -118,49 +272,99 @@ class FlattenVecEnv:
         return self.recv()
 
     def send(self, actions):
-        actions_arr = np.asarray(actions)
-        self.inner.send(actions_arr)
+        if (
+            isinstance(actions, np.ndarray)
+            and actions.dtype == self._atn_dtype
+            and actions.flags["C_CONTIGUOUS"]
+        ):
+            self.inner.send(actions)
+            return
+        self.inner.send(np.ascontiguousarray(actions, dtype=self._atn_dtype))
 
-    def recv(self):
+    def recv(self) -> StepResult:
+        # The vecenv's payload arity is fixed for a run, so the first call
+        # picks a specialized unpacker and rebinds recv to it.
         result = self.inner.recv()
-        has_teacher_actions = False
         if len(result) == 8:
-            o, r, d, t, ta, infos, env_ids, masks = result
-            has_teacher_actions = True
+            self.recv = self._recv_with_teacher_actions
         elif len(result) == 7:
-            o, r, d, t, infos, env_ids, masks = result
-            ta = None
+            self.recv = self._recv_without_teacher_actions
+            result = (*result[:4], None, *result[4:])
         else:
             raise RuntimeError(
                 f"Unexpected vecenv recv payload (expected 7 or 8 items, got {len(result)})."
             )
+        self._check_obs_layout(result[0])
+        return self._normalize(*result)
 
-        o = np.asarray(o).reshape(
-            self.agents_per_batch, *self.single_observation_space.shape
-        )
-        r = np.asarray(r).reshape(self.agents_per_batch)
-        d = np.asarray(d).reshape(self.agents_per_batch)
-        t = np.asarray(t).reshape(self.agents_per_batch)
-        mask = (
-            np.asarray(masks).reshape(self.agents_per_batch)
-            if masks is not None
-            else np.ones(self.agents_per_batch, dtype=bool)
-        )
+    def _recv_with_teacher_actions(self) -> StepResult:
+        return self._normalize(*self.inner.recv())
+
+    def _recv_without_teacher_actions(self) -> StepResult:
+        o, r, d, t, infos, env_ids, masks = self.inner.recv()
+        return self._normalize(o, r, d, t, None, infos, env_ids, masks)
+
+    def _normalize(self, o, r, d, t, ta, infos, env_ids, masks) -> StepResult:
+        o = o if o.shape == self._obs_shape else o.reshape(self._obs_shape)
+        mask = _as_shape(masks, self._flat_shape) if masks is not None else self._default_mask
         env_ids = (
-            np.asarray(env_ids).reshape(self.agents_per_batch)
+            _as_shape(env_ids, self._flat_shape)
             if env_ids is not None
-            else np.arange(self.agents_per_batch, dtype=np.int32)
+            else self._default_env_ids
+        )
+        return StepResult(
+            o,
+            _as_shape(r, self._flat_shape),
+            _as_shape(d, self._flat_shape),
+            _as_shape(t, self._flat_shape),
+            ta,
+            infos if isinstance(infos, list) else [],
+            env_ids,
+            mask,
         )
-        infos = infos if isinstance(infos, list) else []
-        if has_teacher_actions:
-            return o, r, d, t, ta, infos, env_ids, mask
-        return o, r, d, t, infos, env_ids, mask
+
+    def _check_obs_layout(self, o: Any) -> None:
+        """Fail loudly if the vecenv stops handing back zero-copy obs buffers."""
+        if not isinstance(o, np.ndarray) or not o.flags["C_CONTIGUOUS"]:
+            raise RuntimeError("Vecenv observations must be a C-contiguous ndarray.")
+        if o.dtype != self._obs_dtype:
+            raise RuntimeError(
+                f"Vecenv observations have dtype {o.dtype}, expected {self._obs_dtype}."
+            )
 
     def close(self):
         if hasattr(self.inner, "close"):
             self.inner.close()
 
 
+def _make_vecenv(
+    base_config: dict[str, Any],
+    *,
+    num_envs: int,
+    num_workers: int,
+    batch_size: int,
+    backend: Any,
+    reserved_cores: int = 0,
+    **make_kwargs: Any,
+) -> FlattenVecEnv:
+    """Build the PufferLib vecenv for training, wrapped for the trainer.
+
+    Extra keyword arguments go to ``pvector.make``.
+    """
+    vecenv = pvector.make(
+        TribalEnvFactory(base_config),
+        num_envs=num_envs,
+        num_workers=num_workers,
+        batch_size=batch_size,
+        backend=backend,
+        env_kwargs={"cfg": dict(base_config)},
+        **make_kwargs,
+    )
+    if backend is pvector.Multiprocessing:
+        _pin_worker_affinity(vecenv, reserved_cores)
+    return FlattenVecEnv(vecenv)
+
+
 def train(settings: dict[str, Any]) -> None:
     """Run PPO training for Tribal Village using the provided settings."""
 
@@ -172,14 +376,48 @@ def train(settings: dict[str, Any]) -> None:
 
     backend_env = os.environ.get("TRIBAL_VECTOR_BACKEND", "").lower()
     backend = pvector.Serial if backend_env == "serial" else pvector.Multiprocessing
-    if platform.system() == "Darwin":
-        multiprocessing.set_start_method("spawn", force=True)
+    mp_method = os.environ.get("TRIBAL_MP_METHOD", "").lower()
+    if mp_method and mp_method not in multiprocessing.get_all_start_methods():
+        logger.warning(
+            "Ignoring TRIBAL_MP_METHOD=%r: not one of %s on this platform",
+            mp_method,
+            ", ".join(multiprocessing.get_all_start_methods()),
+        )
+        mp_method = ""
+    if mp_method:
+        multiprocessing.set_start_method(mp_method, force=True)
+    elif platform.system() == "Darwin":
+        # forkserver reuses one warm server process instead of re-importing
+        # everything per worker; observations are numpy, so no CUDA sharing
+        try:
+            multiprocessing.set_start_method("forkserver", force=True)
+        except (RuntimeError, ValueError):
+            multiprocessing.set_start_method("spawn", force=True)
+
+    # Workers inherit these; without them each one sizes its BLAS/OpenMP
+    # pools to every core and the workers oversubscribe the machine.
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ.setdefault(var, "1")
+    import torch
+
+    torch.set_num_threads(1)
 
     vector_num_envs = settings.get("vector_num_envs")
     vector_num_workers = settings.get("vector_num_workers")
     cpu_cores = psutil.cpu_count(logical=False) or psutil.cpu_count(logical=True)
+    # Keep cores free for the learner (backward pass, CUDA driver threads)
+    reserved_cores = 2 if torch.cuda.is_available() else 1
     desired_workers = vector_num_workers or cpu_cores or 4
-    num_workers = min(desired_workers, max(1, cpu_cores or desired_workers))
+    num_workers = min(
+        desired_workers, max(1, (cpu_cores or desired_workers) - reserved_cores)
+    )
+    if vector_num_workers is None:
+        logger.info(
+            "Using %s workers on %s physical cores (%s reserved for the learner)",
+            num_workers,
+            cpu_cores,
+            reserved_cores,
+        )
     num_envs = vector_num_envs or DEFAULT_NUM_ENVS
 
     adjusted_envs, adjusted_workers = _resolve_vector_counts(
@@ -215,26 +453,19 @@ def train(settings: dict[str, Any]) -> None:
         )
     )
 
-    env_creator = TribalEnvFactory(base_config)
-
-    vecenv = pvector.make(
-        env_creator,
+    vecenv = _make_vecenv(
+        base_config,
         num_envs=num_envs,
         num_workers=num_workers,
         batch_size=vector_batch_size,
         backend=backend,
-        env_kwargs={"cfg": dict(base_config)},
+        reserved_cores=reserved_cores,
     )
-    agents_per_batch = _getattr_fallback(vecenv, "agents_per_batch")
-    if agents_per_batch is not None:
-        vecenv.num_agents = agents_per_batch
-    vecenv = FlattenVecEnv(vecenv)
-
-    driver_env = _getattr_fallback(vecenv, "driver_env")
-    if driver_env is None:
-        raise RuntimeError(
-            "Vectorized environment did not expose driver_env for shape inference."
-        )
+    # The learner gets whatever cores the workers leave free
+    torch.set_num_threads(max(1, (cpu_cores or 1) - num_workers))
+    agents_per_batch = vecenv.agents_per_batch
+
+    driver_env = vecenv.driver_env
 
     policy_env_info = TribalPolicyEnvInfo(
         observation_space=driver_env.single_observation_space,
@@ -280,14 +511,17 @@ def train(settings: dict[str, Any]) -> None:
     )
     num_workers = max(1, _getattr_fallback(vecenv, "num_workers", default=num_workers))
 
-    effective_agents_per_batch = agents_per_batch or total_agents
-    amended_batch_size = effective_agents_per_batch
+    # The trainer buffers hold every agent; with vector_batch_size < num_envs
+    # evaluate() fills them from several recv batches of agents_per_batch.
+    amended_batch_size = total_agents
     batch_size = settings["batch_size"]
     if batch_size != amended_batch_size:
         logger.warning(
-            "batch_size=%s overridden to %s to match agents_per_batch; larger batches not yet supported",
+            "batch_size=%s overridden to %s to match the total agent count "
+            "(%s per vecenv batch); larger batches not yet supported",
             batch_size,
             amended_batch_size,
+            agents_per_batch,
         )
 
     minibatch_size = settings["minibatch_size"]
@@ -347,6 +581,9 @@ def train(settings: dict[str, Any]) -> None:
 
     trainer = pufferl.PuffeRL(train_args, vecenv, network)
 
+    # evaluate() ends by sending the last batch of actions without waiting,
+    # so with the multiprocessing backend workers step the next rollout while
+    # train() runs; recv at the top of the next evaluate() collects it.
     with DeferSigintContextManager():
         while trainer.global_step < effective_timesteps:
             trainer.evaluate()
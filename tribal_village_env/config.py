@@ -20,17 +20,77 @@ Usage:
 
 from __future__ import annotations
 
+import functools
 import math
+import operator
 import types
-from typing import Any, ClassVar, NoReturn, Self, Union, get_args, get_origin
+from typing import Any, Callable, ClassVar, Literal, NoReturn, Self, Union, get_args, get_origin
 
-from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+
+
+# Literal fields are checked inside pydantic-core, with no Python validator call
+AIMode = Literal["external", "builtin", "hybrid"]
+RenderMode = Literal["rgb_array", "ansi", "human"]
 
 
 def reward_legacy_field_name(field_name: str) -> str:
     return field_name if field_name.endswith("_penalty") else f"{field_name}_reward"
 
 
+@functools.lru_cache(maxsize=None)
+def _field_adapter(cls: type[BaseModel], field_name: str) -> TypeAdapter:
+    """TypeAdapter for a model field; building one compiles a schema, so reuse it."""
+    return TypeAdapter(cls.model_fields[field_name].annotation)
+
+
+@functools.lru_cache(maxsize=1024)
+def _split_key(key: str) -> tuple[str, ...]:
+    return tuple(key.split("."))
+
+
+@functools.lru_cache(maxsize=512)
+def _unwrap_optional(annotation: Any) -> Any:
+    """Return ``X`` for ``X | None`` / ``Optional[X]``, else the annotation unchanged."""
+    if get_origin(annotation) is Union or isinstance(annotation, types.UnionType):
+        non_none_types = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(non_none_types) == 1:
+            return non_none_types[0]
+    return annotation
+
+
+def _dump_config_json(config: BaseModel) -> str:
+    """Indented JSON for error messages, via orjson when it is installed."""
+    try:
+        import orjson
+    except ImportError:
+        return config.model_dump_json(indent=2)
+    try:
+        return orjson.dumps(config.model_dump(), option=orjson.OPT_INDENT_2).decode()
+    except TypeError:
+        return config.model_dump_json(indent=2)
+
+
+def _allows_direct_set(cls: type[BaseModel]) -> bool:
+    """Whether ``_set_validated`` matches what ``setattr`` does on ``cls``."""
+    return (
+        cls.__setattr__ is BaseModel.__setattr__
+        and not cls.model_config.get("validate_assignment")
+        and not cls.model_config.get("frozen")
+    )
+
+
+def _set_validated(model: BaseModel, name: str, value: Any) -> None:
+    """Store an already-validated field value, bypassing BaseModel.__setattr__.
+
+    Mirrors what pydantic's setter does for a plain (non-frozen, no
+    validate_assignment) field, including marking it as explicitly set.
+    Only call it when ``_allows_direct_set`` holds for the model's class.
+    """
+    model.__dict__[name] = value
+    model.__pydantic_fields_set__.add(name)
+
+
 class Config(BaseModel):
     """Base configuration class with override support and validation.
 
@@ -51,11 +111,11 @@ class Config(BaseModel):
             config.override("rewards.heart", 1.5)
             config.override("ppo.learning_rate", 0.0001)
         """
-        key_path = key.split(".")
+        key_path = _split_key(key)
 
         def fail(error: str) -> NoReturn:
             raise ValueError(
-                f"Override failed. Full config:\n{self.model_dump_json(indent=2)}\n"
+                f"Override failed. Full config:\n{_dump_config_json(self)}\n"
                 f"Override {key} failed: {error}"
             )
 
@@ -88,19 +148,17 @@ class Config(BaseModel):
             if next_inner_cfg is None:
                 field = type(inner_cfg).model_fields.get(key_part)
                 if field is not None:
-                    field_type = field.annotation
-                    if get_origin(field_type) is Union or isinstance(field_type, types.UnionType):
-                        non_none_types = [
-                            arg for arg in get_args(field_type) if arg is not type(None)
-                        ]
-                        if len(non_none_types) == 1:
-                            field_type = non_none_types[0]
-                    if isinstance(field_type, type) and issubclass(field_type, Config):
-                        try:
-                            next_inner_cfg = field_type()
-                            setattr(inner_cfg, key_part, next_inner_cfg)
-                        except (TypeError, ValueError):
-                            next_inner_cfg = None
+                    field_type = _unwrap_optional(field.annotation)
+                    if (
+                        isinstance(field_type, type)
+                        and issubclass(field_type, Config)
+                        and not any(f.is_required() for f in field_type.model_fields.values())
+                    ):
+                        # model_construct skips validation on purpose: pydantic
+                        # does not validate defaults, so only the validator
+                        # chain would run, and these configs define none
+                        next_inner_cfg = field_type.model_construct()
+                        setattr(inner_cfg, key_part, next_inner_cfg)
                 if next_inner_cfg is None:
                     failed_path = ".".join(traversed_path + [key_part])
                     fail(f"Cannot auto-initialize None field {failed_path}")
@@ -128,79 +186,159 @@ class Config(BaseModel):
         if field is None:
             fail(f"key {key} is not a valid field")
 
-        value = TypeAdapter(field.annotation).validate_python(value)
-        setattr(inner_cfg, key_path[-1], value)
+        value = _field_adapter(cls, key_path[-1]).validate_python(value)
+        if _allows_direct_set(cls):
+            _set_validated(inner_cfg, key_path[-1], value)
+        else:
+            setattr(inner_cfg, key_path[-1], value)
 
         return self
 
     def update(self, updates: dict[str, Any]) -> Self:
-        """Apply multiple overrides to the config."""
+        """Apply multiple overrides to the config.
+
+        Paths that run through Config fields only use a setter compiled once
+        per (class, key); anything else (dict fields, None fields needing
+        auto-initialization, bad keys) goes through ``override``.
+        """
+        cls = type(self)
         for key, value in updates.items():
-            self.override(key, value)
+            setter = _compile_setter(cls, key)
+            if setter is None or not setter(self, value):
+                self.override(key, value)
         return self
 
 
+@functools.lru_cache(maxsize=1024)
+def _compile_setter(
+    cls: type[Config], key: str
+) -> Callable[[Config, Any], bool] | None:
+    """Resolve ``key`` against the model classes once and return a direct setter.
+
+    The setter returns False when the runtime object does not match the
+    resolved path (e.g. an intermediate field is still None), so the caller
+    can fall back to ``Config.override``. Returns None when the path does not
+    run through Config fields only, or when the leaf's class customizes
+    assignment (frozen, validate_assignment or its own ``__setattr__``).
+    """
+    key_path = _split_key(key)
+    owner: type[Config] = cls
+    for part in key_path[:-1]:
+        field = owner.model_fields.get(part)
+        if field is None:
+            return None
+        field_type = _unwrap_optional(field.annotation)
+        if not (isinstance(field_type, type) and issubclass(field_type, Config)):
+            return None
+        owner = field_type
+
+    leaf = key_path[-1]
+    if leaf not in owner.model_fields or not _allows_direct_set(owner):
+        return None
+
+    adapter = _field_adapter(owner, leaf)
+    get_parent = operator.attrgetter(".".join(key_path[:-1])) if len(key_path) > 1 else None
+
+    def setter(root: Config, value: Any) -> bool:
+        try:
+            parent = get_parent(root) if get_parent is not None else root
+        except AttributeError:
+            return False
+        # Subclasses may customize assignment, so only the resolved class qualifies
+        if type(parent) is not owner:
+            return False
+        _set_validated(parent, leaf, adapter.validate_python(value))
+        return True
+
+    return setter
+
+
 class RewardConfig(Config):
     """Configuration for reward parameters.
 
     Rewards are applied when the corresponding events occur in the game.
     Penalties are negative rewards applied on certain conditions.
-    Use math.nan for rewards that should be inherited from defaults.
+    Leave a reward as None to keep the engine default.
     """
 
-    heart: float = Field(
-        default=math.nan,
+    heart: float | None = Field(
+        default=None,
         description="Reward for collecting a heart (healing item)",
     )
-    ore: float = Field(
-        default=math.nan,
+    ore: float | None = Field(
+        default=None,
         description="Reward for collecting ore resource",
     )
-    bar: float = Field(
-        default=math.nan,
+    bar: float | None = Field(
+        default=None,
         description="Reward for creating a metal bar from ore",
     )
-    wood: float = Field(
-        default=math.nan,
+    wood: float | None = Field(
+        default=None,
         description="Reward for collecting wood resource",
     )
-    water: float = Field(
-        default=math.nan,
+    water: float | None = Field(
+        default=None,
         description="Reward for collecting water resource",
     )
-    wheat: float = Field(
-        default=math.nan,
+    wheat: float | None = Field(
+        default=None,
         description="Reward for harvesting wheat",
     )
-    spear: float = Field(
-        default=math.nan,
+    spear: float | None = Field(
+        default=None,
         description="Reward for crafting a spear weapon",
     )
-    armor: float = Field(
-        default=math.nan,
+    armor: float | None = Field(
+        default=None,
         description="Reward for crafting armor",
     )
-    food: float = Field(
-        default=math.nan,
+    food: float | None = Field(
+        default=None,
         description="Reward for producing food",
     )
-    cloth: float = Field(
-        default=math.nan,
+    cloth: float | None = Field(
+        default=None,
         description="Reward for producing cloth",
     )
-    tumor_kill: float = Field(
-        default=math.nan,
+    tumor_kill: float | None = Field(
+        default=None,
         description="Reward for killing a tumor enemy",
     )
-    survival_penalty: float = Field(
-        default=math.nan,
+    survival_penalty: float | None = Field(
+        default=None,
         description="Penalty applied each step for agent survival",
     )
-    death_penalty: float = Field(
-        default=math.nan,
+    death_penalty: float | None = Field(
+        default=None,
         description="Penalty applied when an agent dies",
     )
 
+
+# (field name, legacy dict key) pairs, resolved once at import
+_REWARD_LEGACY_NAMES: tuple[tuple[str, str], ...] = tuple(
+    (field_name, reward_legacy_field_name(field_name))
+    for field_name in RewardConfig.model_fields
+)
+
+
+def _nan_to_none(value: Any) -> Any:
+    """Legacy dicts used NaN for "unset"; map it to None."""
+    return None if isinstance(value, float) and math.isnan(value) else value
+
+
+# (field name, default) for the flat keys read by EnvironmentConfig.from_legacy_dict
+_LEGACY_ENV_DEFAULTS: tuple[tuple[str, Any], ...] = (
+    ("max_steps", 10_000),
+    ("victory_condition", 0),
+    ("tumor_spawn_rate", None),
+    ("ai_mode", "external"),
+    ("render_mode", "rgb_array"),
+    ("render_scale", 4),
+    ("ansi_buffer_size", 1_000_000),
+)
+
+
 class EnvironmentConfig(Config):
     """Configuration for the Tribal Village environment.
 
@@ -219,19 +357,19 @@ class EnvironmentConfig(Config):
         ge=0,
         description="Victory condition type (0=survival, others TBD)",
     )
-    tumor_spawn_rate: float = Field(
-        default=math.nan,
-        description="Rate at which tumor enemies spawn (per step probability)",
+    tumor_spawn_rate: float | None = Field(
+        default=None,
+        description="Rate at which tumor enemies spawn (per step probability; None = engine default)",
     )
 
     # AI control mode
-    ai_mode: str = Field(
+    ai_mode: AIMode = Field(
         default="external",
         description="AI mode: 'external' (Python controls), 'builtin' (scripted AI), 'hybrid' (scripted + Python override)",
     )
 
     # Rendering parameters
-    render_mode: str = Field(
+    render_mode: RenderMode = Field(
         default="rgb_array",
         description="Render mode: 'rgb_array', 'ansi', or 'human'",
     )
@@ -252,22 +390,6 @@ class EnvironmentConfig(Config):
         description="Reward parameters for various game events",
     )
 
-    @field_validator("ai_mode")
-    @classmethod
-    def validate_ai_mode(cls, v: str) -> str:
-        valid_modes = {"external", "builtin", "hybrid"}
-        if v not in valid_modes:
-            raise ValueError(f"ai_mode must be one of {valid_modes}, got '{v}'")
-        return v
-
-    @field_validator("render_mode")
-    @classmethod
-    def validate_render_mode(cls, v: str) -> str:
-        valid_modes = {"rgb_array", "ansi", "human"}
-        if v not in valid_modes:
-            raise ValueError(f"render_mode must be one of {valid_modes}, got '{v}'")
-        return v
-
     def to_legacy_dict(self) -> dict[str, Any]:
         """Convert to legacy dictionary format for backward compatibility."""
         result: dict[str, Any] = {
@@ -278,13 +400,14 @@ class EnvironmentConfig(Config):
             "render_scale": self.render_scale,
         }
 
-        if not math.isnan(self.tumor_spawn_rate):
+        if self.tumor_spawn_rate is not None:
             result["tumor_spawn_rate"] = self.tumor_spawn_rate
 
-        for field_name in RewardConfig.model_fields:
-            value = getattr(self.rewards, field_name)
-            if not math.isnan(value):
-                result[reward_legacy_field_name(field_name)] = value
+        rewards = self.rewards
+        for field_name, legacy_name in _REWARD_LEGACY_NAMES:
+            value = getattr(rewards, field_name)
+            if value is not None:
+                result[legacy_name] = value
 
         return result
 
@@ -292,21 +415,15 @@ class EnvironmentConfig(Config):
     def from_legacy_dict(cls, config: dict[str, Any]) -> EnvironmentConfig:
         """Create config from legacy dictionary format."""
         reward_kwargs = {
-            field_name: config.get(reward_legacy_field_name(field_name), math.nan)
-            for field_name in RewardConfig.model_fields
+            field_name: _nan_to_none(config.get(legacy_name))
+            for field_name, legacy_name in _REWARD_LEGACY_NAMES
+        }
+        env_kwargs = {
+            field_name: config.get(field_name, default)
+            for field_name, default in _LEGACY_ENV_DEFAULTS
         }
-        rewards = RewardConfig(**reward_kwargs)
-
-        return cls(
-            max_steps=config.get("max_steps", 10_000),
-            victory_condition=config.get("victory_condition", 0),
-            tumor_spawn_rate=config.get("tumor_spawn_rate", math.nan),
-            ai_mode=config.get("ai_mode", "external"),
-            render_mode=config.get("render_mode", "rgb_array"),
-            render_scale=config.get("render_scale", 4),
-            ansi_buffer_size=config.get("ansi_buffer_size", 1_000_000),
-            rewards=rewards,
-        )
+        env_kwargs["tumor_spawn_rate"] = _nan_to_none(env_kwargs["tumor_spawn_rate"])
+        return cls(**env_kwargs, rewards=RewardConfig(**reward_kwargs))
 
 
 class PPOConfig(Config):
@@ -7,8 +7,12 @@ Eliminates ALL conversion overhead by using direct numpy buffer communication.
 from __future__ import annotations
 
 import ctypes
-import platform
+import functools
+import math
+import sys
+import weakref
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
 import numpy as np
@@ -26,20 +30,20 @@ ACTION_VERB_COUNT = 11
 ACTION_ARGUMENT_COUNT = 28
 ACTION_SPACE_SIZE = ACTION_VERB_COUNT * ACTION_ARGUMENT_COUNT
 
-_PLATFORM_LIB_NAMES = {
-    "Darwin": "libtribal_village.dylib",
-    "Windows": "libtribal_village.dll",
-}
-_DEFAULT_LIB_NAME = "libtribal_village.so"
+# Per-agent info entry; read-only so one instance can back every result
+_NO_INFO = MappingProxyType({})
+
+_LIB_NAME = "libtribal_village" + (
+    ".dylib" if sys.platform == "darwin" else ".dll" if sys.platform == "win32" else ".so"
+)
 
 
 def _find_library() -> Path:
     """Locate the Nim shared library for the current platform."""
-    lib_name = _PLATFORM_LIB_NAMES.get(platform.system(), _DEFAULT_LIB_NAME)
     package_dir = Path(__file__).resolve().parent
     candidate_paths = [
-        package_dir.parent / lib_name,
-        package_dir / lib_name,
+        package_dir.parent / _LIB_NAME,
+        package_dir / _LIB_NAME,
     ]
     lib_path = next((p for p in candidate_paths if p.exists()), None)
     if lib_path is None:
@@ -72,27 +76,205 @@ class NimConfig(ctypes.Structure):
 
     @classmethod
     def from_config(cls, config: EnvironmentConfig) -> NimConfig:
-        """Create NimConfig from typed EnvironmentConfig."""
+        """Create NimConfig from typed EnvironmentConfig.
+
+        Unset (None) floats are sent as NaN, which Nim reads as "keep default".
+        """
+        rewards = config.rewards
         return cls(
             max_steps=config.max_steps,
             victory_condition=config.victory_condition,
-            tumor_spawn_rate=float(config.tumor_spawn_rate),
-            heart_reward=float(config.rewards.heart),
-            ore_reward=float(config.rewards.ore),
-            bar_reward=float(config.rewards.bar),
-            wood_reward=float(config.rewards.wood),
-            water_reward=float(config.rewards.water),
-            wheat_reward=float(config.rewards.wheat),
-            spear_reward=float(config.rewards.spear),
-            armor_reward=float(config.rewards.armor),
-            food_reward=float(config.rewards.food),
-            cloth_reward=float(config.rewards.cloth),
-            tumor_kill_reward=float(config.rewards.tumor_kill),
-            survival_penalty=float(config.rewards.survival_penalty),
-            death_penalty=float(config.rewards.death_penalty),
+            tumor_spawn_rate=_nim_float(config.tumor_spawn_rate),
+            heart_reward=_nim_float(rewards.heart),
+            ore_reward=_nim_float(rewards.ore),
+            bar_reward=_nim_float(rewards.bar),
+            wood_reward=_nim_float(rewards.wood),
+            water_reward=_nim_float(rewards.water),
+            wheat_reward=_nim_float(rewards.wheat),
+            spear_reward=_nim_float(rewards.spear),
+            armor_reward=_nim_float(rewards.armor),
+            food_reward=_nim_float(rewards.food),
+            cloth_reward=_nim_float(rewards.cloth),
+            tumor_kill_reward=_nim_float(rewards.tumor_kill),
+            survival_penalty=_nim_float(rewards.survival_penalty),
+            death_penalty=_nim_float(rewards.death_penalty),
         )
 
 
+def _nim_float(value: float | None) -> float:
+    return math.nan if value is None else float(value)
+
+
+# Layout must mirror CEnvironmentConfig in src/ffi.nim (all 4-byte fields, no padding);
+# checked once here so a drifted struct fails at import rather than inside Nim.
+_NIMCONFIG_FIELD_NAMES = tuple(name for name, _ in NimConfig._fields_)
+_NIMCONFIG_SIZE = ctypes.sizeof(NimConfig)
+if _NIMCONFIG_SIZE != 4 * len(_NIMCONFIG_FIELD_NAMES):
+    raise ImportError(f"NimConfig layout is {_NIMCONFIG_SIZE} bytes, expected packed 4-byte fields")
+
+
+def _setup_ctypes_interface(lib: ctypes.CDLL) -> None:
+    """Configure argtypes/restype for every FFI entry point on ``lib``."""
+    config_ptr = ctypes.POINTER(NimConfig)
+    func_specs = [
+        # required
+        ("tribal_village_create", [], ctypes.c_void_p, False),
+        ("tribal_village_set_config", [ctypes.c_void_p, config_ptr], ctypes.c_int32, False),
+        (
+            "tribal_village_reset_and_get_obs",
+            [
+                ctypes.c_void_p,
+                ctypes.c_void_p,
+                ctypes.c_void_p,
+                ctypes.c_void_p,
+                ctypes.c_void_p,
+                ctypes.c_int32,
+            ],
+            ctypes.c_int32,
+            False,
+        ),
+        (
+            "tribal_village_step_with_pointers",
+            [
+                ctypes.c_void_p,
+                ctypes.c_void_p,
+                ctypes.c_void_p,
+                ctypes.c_void_p,
+                ctypes.c_void_p,
+                ctypes.c_void_p,
+            ],
+            ctypes.c_int32,
+            False,
+        ),
+        (
+            "tribal_village_step_batch",
+            [
+                ctypes.c_void_p,
+                ctypes.c_void_p,
+                ctypes.c_int32,
+                ctypes.c_void_p,
+                ctypes.c_void_p,
+                ctypes.c_void_p,
+                ctypes.c_void_p,
+            ],
+            ctypes.c_int32,
+            True,
+        ),
+        ("tribal_village_destroy", [ctypes.c_void_p], None, False),
+        ("tribal_village_get_num_agents", [], ctypes.c_int32, False),
+        ("tribal_village_get_obs_layers", [], ctypes.c_int32, False),
+        ("tribal_village_get_obs_width", [], ctypes.c_int32, False),
+        ("tribal_village_get_obs_height", [], ctypes.c_int32, False),
+        # AI mode control
+        ("tribal_village_set_ai_mode", [ctypes.c_int32], ctypes.c_int32, True),
+        # optional
+        ("tribal_village_get_map_width", [], ctypes.c_int32, True),
+        ("tribal_village_get_map_height", [], ctypes.c_int32, True),
+        (
+            "tribal_village_render_rgb",
+            [
+                ctypes.c_void_p,
+                ctypes.c_void_p,
+                ctypes.c_int32,
+                ctypes.c_int32,
+            ],
+            ctypes.c_int32,
+            True,
+        ),
+        (
+            "tribal_village_render_ansi",
+            [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_int32],
+            ctypes.c_int32,
+            True,
+        ),
+        # Market trading
+        ("tribal_village_init_market_prices", [ctypes.c_void_p], None, True),
+        ("tribal_village_get_market_price", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32], ctypes.c_int32, True),
+        ("tribal_village_set_market_price", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32, ctypes.c_int32], None, True),
+        ("tribal_village_market_buy", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32, ctypes.c_int32, ctypes.POINTER(ctypes.c_int32), ctypes.POINTER(ctypes.c_int32)], ctypes.c_int32, True),
+        ("tribal_village_market_sell", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32, ctypes.c_int32, ctypes.POINTER(ctypes.c_int32), ctypes.POINTER(ctypes.c_int32)], ctypes.c_int32, True),
+        ("tribal_village_market_sell_inventory", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32, ctypes.POINTER(ctypes.c_int32), ctypes.POINTER(ctypes.c_int32)], ctypes.c_int32, True),
+        ("tribal_village_market_buy_food", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32, ctypes.POINTER(ctypes.c_int32), ctypes.POINTER(ctypes.c_int32)], ctypes.c_int32, True),
+        ("tribal_village_decay_market_prices", [ctypes.c_void_p], None, True),
+        # Tech tree research actions
+        ("tribal_village_research_blacksmith", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32, ctypes.c_int32], ctypes.c_int32, True),
+        ("tribal_village_research_university", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32, ctypes.c_int32], ctypes.c_int32, True),
+        ("tribal_village_research_castle", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32, ctypes.c_int32], ctypes.c_int32, True),
+        ("tribal_village_research_unit_upgrade", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32, ctypes.c_int32], ctypes.c_int32, True),
+        # Fog of war queries
+        ("tribal_village_is_tile_revealed", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32, ctypes.c_int32], ctypes.c_int32, True),
+        ("tribal_village_get_revealed_tile_count", [ctypes.c_void_p, ctypes.c_int32], ctypes.c_int32, True),
+        ("tribal_village_clear_revealed_map", [ctypes.c_void_p, ctypes.c_int32], None, True),
+        # Tech tree state queries
+        ("tribal_village_has_blacksmith_upgrade", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32], ctypes.c_int32, True),
+        ("tribal_village_has_university_tech", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32], ctypes.c_int32, True),
+        ("tribal_village_has_castle_tech", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32], ctypes.c_int32, True),
+        ("tribal_village_has_unit_upgrade", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32], ctypes.c_int32, True),
+        # Threat map queries
+        ("tribal_village_has_known_threats", [ctypes.c_void_p, ctypes.c_int32], ctypes.c_int32, True),
+        ("tribal_village_get_nearest_threat", [ctypes.c_void_p, ctypes.c_int32, ctypes.POINTER(ctypes.c_int32), ctypes.POINTER(ctypes.c_int32), ctypes.POINTER(ctypes.c_int32)], ctypes.c_int32, True),
+        ("tribal_village_get_threats_in_range", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32], ctypes.c_int32, True),
+        ("tribal_village_get_threat_at", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32, ctypes.c_int32], ctypes.c_int32, True),
+        # AI difficulty control
+        ("tribal_village_get_difficulty_level", [ctypes.c_void_p, ctypes.c_int32], ctypes.c_int32, True),
+        ("tribal_village_set_difficulty_level", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32], None, True),
+        ("tribal_village_get_difficulty", [ctypes.c_void_p, ctypes.c_int32], ctypes.c_float, True),
+        ("tribal_village_set_difficulty", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_float], None, True),
+        ("tribal_village_set_adaptive_difficulty", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32], None, True),
+        ("tribal_village_get_decision_delay_chance", [ctypes.c_void_p, ctypes.c_int32], ctypes.c_float, True),
+        ("tribal_village_set_decision_delay_chance", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_float], None, True),
+        ("tribal_village_enable_adaptive_difficulty", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_float], None, True),
+        ("tribal_village_disable_adaptive_difficulty", [ctypes.c_void_p, ctypes.c_int32], None, True),
+        ("tribal_village_is_adaptive_difficulty_enabled", [ctypes.c_void_p, ctypes.c_int32], ctypes.c_int32, True),
+        ("tribal_village_get_adaptive_difficulty_target", [ctypes.c_void_p, ctypes.c_int32], ctypes.c_float, True),
+        ("tribal_village_get_threat_response_enabled", [ctypes.c_void_p, ctypes.c_int32], ctypes.c_int32, True),
+        ("tribal_village_set_threat_response_enabled", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32], None, True),
+        ("tribal_village_get_advanced_targeting_enabled", [ctypes.c_void_p, ctypes.c_int32], ctypes.c_int32, True),
+        ("tribal_village_set_advanced_targeting_enabled", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32], None, True),
+        ("tribal_village_get_coordination_enabled", [ctypes.c_void_p, ctypes.c_int32], ctypes.c_int32, True),
+        ("tribal_village_set_coordination_enabled", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32], None, True),
+        ("tribal_village_get_optimal_build_order_enabled", [ctypes.c_void_p, ctypes.c_int32], ctypes.c_int32, True),
+        ("tribal_village_set_optimal_build_order_enabled", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32], None, True),
+    ]
+
+    for name, argtypes, restype, optional in func_specs:
+        func = getattr(lib, name, None)
+        if func is None and optional:
+            continue
+        if func is None:
+            raise AttributeError(f"Required symbol missing: {name}")
+        if argtypes is not None:
+            func.argtypes = argtypes
+        if restype is not None:
+            func.restype = restype
+
+
+@functools.lru_cache(maxsize=1)
+def _load_library() -> ctypes.CDLL:
+    """Load the Nim library and configure its signatures once per process.
+
+    Every TribalVillageEnv in a process shares the same library handle (and
+    Nim's global state), so constructing N envs does one load, not N.
+    """
+    lib = ctypes.CDLL(str(_find_library()))
+    _setup_ctypes_interface(lib)
+    return lib
+
+
+# Nim keeps a single global environment per process and tribal_village_destroy
+# clears it regardless of the pointer passed, so only the env that created the
+# current global state may tear it down.
+_nim_owner: object | None = None
+
+
+def _destroy_env(lib: ctypes.CDLL, env_ptr: int, owner: object) -> None:
+    """Finalizer for a TribalVillageEnv; holds no reference to the env itself."""
+    global _nim_owner
+    if _nim_owner is owner:
+        _nim_owner = None
+        lib.tribal_village_destroy(env_ptr)
+
+
 class TribalVillageEnv(pufferlib.PufferEnv):
     """
     Ultra-fast tribal village environment using direct buffer interface.
@@ -105,7 +287,9 @@ class TribalVillageEnv(pufferlib.PufferEnv):
             - EnvironmentConfig: Typed, validated configuration (recommended)
             - Dict[str, Any]: Legacy dictionary format (backward compatible)
             - None: Use default configuration
-        buf: Optional buffer for PufferLib integration
+        buf: Optional buffer for PufferLib integration. Envs given one are
+            driven by a PufferLib vector backend, so ``reset()`` returns
+            arrays by default.
     """
 
     def __init__(
@@ -127,9 +311,12 @@ class TribalVillageEnv(pufferlib.PufferEnv):
         self.max_steps = self._typed_config.max_steps
         self._render_mode = self._typed_config.render_mode
 
-        # Load the optimized Nim library - cross-platform
-        self.lib = ctypes.CDLL(str(_find_library()))
-        self._setup_ctypes_interface()
+        # Load the optimized Nim library - cross-platform.
+        # CDLL (unlike PyDLL) already releases the GIL around every call, but
+        # Nim keeps a single global environment per process: parallel envs
+        # must live in separate processes (PufferLib Multiprocessing), not threads.
+        self.lib = _load_library()
+        self._bind_ffi()
 
         # Get environment dimensions
         self.total_agents = self.lib.tribal_village_get_num_agents()
@@ -145,6 +332,10 @@ class TribalVillageEnv(pufferlib.PufferEnv):
             height = self.map_height * self.render_scale
             width = self.map_width * self.render_scale
             self._rgb_frame = np.zeros((height, width, 3), dtype=np.uint8)
+            # The frame is never reallocated, so its render_rgb args are fixed
+            self._rgb_args: tuple[int, int, int] | None = (
+                self._rgb_frame.ctypes.data, width, height
+            )
         except (AttributeError, OSError, ValueError, TypeError):
             # FFI function may not exist (AttributeError), library call may fail (OSError),
             # or return value may not convert (ValueError/TypeError) — rendering is optional
@@ -152,10 +343,17 @@ class TribalVillageEnv(pufferlib.PufferEnv):
             self.map_height = None
             self.render_scale = 1
             self._rgb_frame = None
+            self._rgb_args = None
+        self._ansi_buffer: ctypes.Array[ctypes.c_char] | None = None
 
         # PufferLib controls all agents
         self.num_agents = self.total_agents
         self.agents = [f"agent_{i}" for i in range(self.total_agents)]
+        self._agent_keys = tuple(self.agents)
+        self._agent_index = {key: i for i, key in enumerate(self._agent_keys)}
+        self._obs_views: dict[str, np.ndarray] = {}
+        self._obs_views_source: np.ndarray | None = None
+        self._rng = np.random.default_rng()
         self.possible_agents = self.agents.copy()
 
         # Define spaces - use direct observation shape (no sparse tokens!)
@@ -169,13 +367,15 @@ class TribalVillageEnv(pufferlib.PufferEnv):
         self.is_continuous = False
 
         super().__init__(buf)
+        self._reset_as_dict = buf is None
 
         # Set up joint action space like metta does
         self.action_space = pufferlib.spaces.joint_space(
             self.single_action_space, self.num_agents
         )
         if hasattr(self, "actions"):
-            self.actions = self.actions.astype(np.int32)
+            # Keep PufferLib's (possibly shared-memory) buffer when it is already int32
+            self.actions = self.actions.astype(np.int32, copy=False)
 
         # PufferLib will set these buffers - don't allocate our own!
         self.observations: np.ndarray
@@ -185,11 +385,29 @@ class TribalVillageEnv(pufferlib.PufferEnv):
 
         # Only allocate actions buffer (input to environment)
         self.actions_buffer = np.zeros(self.total_agents, dtype=np.uint16)
+        self._actions_ptr: int = self.actions_buffer.ctypes.data
+        # Addresses of the PufferLib buffers, refreshed when set_buffers rebinds them
+        self._ptr_arrays: tuple[np.ndarray, ...] = ()
+        self._buffer_ptrs: tuple[int, int, int, int] = (0, 0, 0, 0)
+
+        # Stacked outputs for step_batch(), grown on demand and reused
+        self._batch_capacity = 0
+        self._batch_obs: np.ndarray | None = None
+        self._batch_rewards: np.ndarray | None = None
+        self._batch_terminals: np.ndarray | None = None
+        self._batch_truncations: np.ndarray | None = None
 
         # Initialize environment
         self.env_ptr = self.lib.tribal_village_create()
         if not self.env_ptr:
             raise RuntimeError("Failed to create Nim environment")
+        # Destroy the Nim env even if close() is never called (e.g. envs
+        # dropped by a vectorized pool); close() runs the same finalizer.
+        global _nim_owner
+        owner = _nim_owner = object()
+        self._finalizer = weakref.finalize(
+            self, _destroy_env, self.lib, self.env_ptr, owner
+        )
 
         self._apply_ai_mode()
         self._apply_nim_config()
@@ -215,178 +433,55 @@ class TribalVillageEnv(pufferlib.PufferEnv):
         mode = getattr(self, "_render_mode", "ansi")
 
         # Prefer native RGB if requested and available
-        if mode == "rgb_array" and getattr(self, "_rgb_frame", None) is not None:
-            ptr = self._rgb_frame.ctypes.data_as(ctypes.c_void_p)
-            width = int(self._rgb_frame.shape[1])
-            height = int(self._rgb_frame.shape[0])
-            try:
-                ok = self.lib.tribal_village_render_rgb(
-                    self.env_ptr, ptr, width, height
-                )
-            except AttributeError:
-                ok = 0
-            if ok:
+        if (
+            mode == "rgb_array"
+            and getattr(self, "_rgb_args", None) is not None
+            and self._ffi_render_rgb is not None
+        ):
+            if self._ffi_render_rgb(self.env_ptr, *self._rgb_args):
                 return self._rgb_frame
-            # fall through to ansi if RGB export missing
+            # fall through to ansi if RGB export failed
 
-        buf_size = self._typed_config.ansi_buffer_size
-        cbuf = ctypes.create_string_buffer(buf_size)
-        try:
-            n_written = self.lib.tribal_village_render_ansi(
-                self.env_ptr,
-                ctypes.cast(cbuf, ctypes.c_void_p),
-                ctypes.c_int32(buf_size),
-            )
-        except AttributeError:
+        if self._ffi_render_ansi is None:
             return "(render not available in Nim build)"
+        if self._ansi_buffer is None:
+            # Allocated once on first ANSI render; Nim overwrites it each call
+            self._ansi_buffer = ctypes.create_string_buffer(
+                self._typed_config.ansi_buffer_size
+            )
+        buf_addr = ctypes.addressof(self._ansi_buffer)
+        n_written = self._ffi_render_ansi(
+            self.env_ptr, buf_addr, len(self._ansi_buffer)
+        )
 
         if n_written <= 0:
             return ""
-        return cbuf.value.decode("utf-8", errors="replace")
-
-    def _setup_ctypes_interface(self):
-        """Setup ctypes for direct buffer functions."""
-        config_ptr = ctypes.POINTER(NimConfig)
-        func_specs = [
-            # required
-            ("tribal_village_create", [], ctypes.c_void_p, False),
-            ("tribal_village_set_config", [ctypes.c_void_p, config_ptr], ctypes.c_int32, False),
-            (
-                "tribal_village_reset_and_get_obs",
-                [
-                    ctypes.c_void_p,
-                    ctypes.c_void_p,
-                    ctypes.c_void_p,
-                    ctypes.c_void_p,
-                    ctypes.c_void_p,
-                ],
-                ctypes.c_int32,
-                False,
-            ),
-            (
-                "tribal_village_step_with_pointers",
-                [
-                    ctypes.c_void_p,
-                    ctypes.c_void_p,
-                    ctypes.c_void_p,
-                    ctypes.c_void_p,
-                    ctypes.c_void_p,
-                    ctypes.c_void_p,
-                ],
-                ctypes.c_int32,
-                False,
-            ),
-            ("tribal_village_destroy", [ctypes.c_void_p], None, False),
-            ("tribal_village_get_num_agents", [], ctypes.c_int32, False),
-            ("tribal_village_get_obs_layers", [], ctypes.c_int32, False),
-            ("tribal_village_get_obs_width", [], ctypes.c_int32, False),
-            ("tribal_village_get_obs_height", [], ctypes.c_int32, False),
-            # AI mode control
-            ("tribal_village_set_ai_mode", [ctypes.c_int32], ctypes.c_int32, True),
-            # optional
-            ("tribal_village_get_map_width", [], ctypes.c_int32, True),
-            ("tribal_village_get_map_height", [], ctypes.c_int32, True),
-            (
-                "tribal_village_render_rgb",
-                [
-                    ctypes.c_void_p,
-                    ctypes.c_void_p,
-                    ctypes.c_int32,
-                    ctypes.c_int32,
-                ],
-                ctypes.c_int32,
-                True,
-            ),
-            (
-                "tribal_village_render_ansi",
-                [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_int32],
-                ctypes.c_int32,
-                True,
-            ),
-            # Market trading
-            ("tribal_village_init_market_prices", [ctypes.c_void_p], None, True),
-            ("tribal_village_get_market_price", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32], ctypes.c_int32, True),
-            ("tribal_village_set_market_price", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32, ctypes.c_int32], None, True),
-            ("tribal_village_market_buy", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32, ctypes.c_int32, ctypes.POINTER(ctypes.c_int32), ctypes.POINTER(ctypes.c_int32)], ctypes.c_int32, True),
-            ("tribal_village_market_sell", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32, ctypes.c_int32, ctypes.POINTER(ctypes.c_int32), ctypes.POINTER(ctypes.c_int32)], ctypes.c_int32, True),
-            ("tribal_village_market_sell_inventory", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32, ctypes.POINTER(ctypes.c_int32), ctypes.POINTER(ctypes.c_int32)], ctypes.c_int32, True),
-            ("tribal_village_market_buy_food", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32, ctypes.POINTER(ctypes.c_int32), ctypes.POINTER(ctypes.c_int32)], ctypes.c_int32, True),
-            ("tribal_village_decay_market_prices", [ctypes.c_void_p], None, True),
-            # Tech tree research actions
-            ("tribal_village_research_blacksmith", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32, ctypes.c_int32], ctypes.c_int32, True),
-            ("tribal_village_research_university", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32, ctypes.c_int32], ctypes.c_int32, True),
-            ("tribal_village_research_castle", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32, ctypes.c_int32], ctypes.c_int32, True),
-            ("tribal_village_research_unit_upgrade", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32, ctypes.c_int32], ctypes.c_int32, True),
-            # Fog of war queries
-            ("tribal_village_is_tile_revealed", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32, ctypes.c_int32], ctypes.c_int32, True),
-            ("tribal_village_get_revealed_tile_count", [ctypes.c_void_p, ctypes.c_int32], ctypes.c_int32, True),
-            ("tribal_village_clear_revealed_map", [ctypes.c_void_p, ctypes.c_int32], None, True),
-            # Tech tree state queries
-            ("tribal_village_has_blacksmith_upgrade", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32], ctypes.c_int32, True),
-            ("tribal_village_has_university_tech", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32], ctypes.c_int32, True),
-            ("tribal_village_has_castle_tech", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32], ctypes.c_int32, True),
-            ("tribal_village_has_unit_upgrade", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32], ctypes.c_int32, True),
-            # Threat map queries
-            ("tribal_village_has_known_threats", [ctypes.c_void_p, ctypes.c_int32], ctypes.c_int32, True),
-            ("tribal_village_get_nearest_threat", [ctypes.c_void_p, ctypes.c_int32, ctypes.POINTER(ctypes.c_int32), ctypes.POINTER(ctypes.c_int32), ctypes.POINTER(ctypes.c_int32)], ctypes.c_int32, True),
-            ("tribal_village_get_threats_in_range", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32], ctypes.c_int32, True),
-            ("tribal_village_get_threat_at", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32, ctypes.c_int32], ctypes.c_int32, True),
-            # AI difficulty control
-            ("tribal_village_get_difficulty_level", [ctypes.c_void_p, ctypes.c_int32], ctypes.c_int32, True),
-            ("tribal_village_set_difficulty_level", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32], None, True),
-            ("tribal_village_get_difficulty", [ctypes.c_void_p, ctypes.c_int32], ctypes.c_float, True),
-            ("tribal_village_set_difficulty", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_float], None, True),
-            ("tribal_village_set_adaptive_difficulty", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32], None, True),
-            ("tribal_village_get_decision_delay_chance", [ctypes.c_void_p, ctypes.c_int32], ctypes.c_float, True),
-            ("tribal_village_set_decision_delay_chance", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_float], None, True),
-            ("tribal_village_enable_adaptive_difficulty", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_float], None, True),
-            ("tribal_village_disable_adaptive_difficulty", [ctypes.c_void_p, ctypes.c_int32], None, True),
-            ("tribal_village_is_adaptive_difficulty_enabled", [ctypes.c_void_p, ctypes.c_int32], ctypes.c_int32, True),
-            ("tribal_village_get_adaptive_difficulty_target", [ctypes.c_void_p, ctypes.c_int32], ctypes.c_float, True),
-            ("tribal_village_get_threat_response_enabled", [ctypes.c_void_p, ctypes.c_int32], ctypes.c_int32, True),
-            ("tribal_village_set_threat_response_enabled", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32], None, True),
-            ("tribal_village_get_advanced_targeting_enabled", [ctypes.c_void_p, ctypes.c_int32], ctypes.c_int32, True),
-            ("tribal_village_set_advanced_targeting_enabled", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32], None, True),
-            ("tribal_village_get_coordination_enabled", [ctypes.c_void_p, ctypes.c_int32], ctypes.c_int32, True),
-            ("tribal_village_set_coordination_enabled", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32], None, True),
-            ("tribal_village_get_optimal_build_order_enabled", [ctypes.c_void_p, ctypes.c_int32], ctypes.c_int32, True),
-            ("tribal_village_set_optimal_build_order_enabled", [ctypes.c_void_p, ctypes.c_int32, ctypes.c_int32], None, True),
-        ]
-
-        for name, argtypes, restype, optional in func_specs:
-            func = getattr(self.lib, name, None)
-            if func is None and optional:
-                continue
-            if func is None:
-                raise AttributeError(f"Required symbol missing: {name}")
-            if argtypes is not None:
-                func.argtypes = argtypes
-            if restype is not None:
-                func.restype = restype
+        return ctypes.string_at(buf_addr, n_written).decode("utf-8", errors="replace")
+
+    def _bind_ffi(self) -> None:
+        # Bind per-step entry points once; call sites skip the CDLL lookup
+        self._ffi_reset = self.lib.tribal_village_reset_and_get_obs
+        self._ffi_step = self.lib.tribal_village_step_with_pointers
+        self._ffi_step_batch = getattr(self.lib, "tribal_village_step_batch", None)
+        self._ffi_render_rgb = getattr(self.lib, "tribal_village_render_rgb", None)
+        self._ffi_render_ansi = getattr(self.lib, "tribal_village_render_ansi", None)
 
     def _optional_ffi(self, name: str, *args, default=None):
         """Call an optional FFI function, returning default if it doesn't exist.
 
-        argtypes/restype are already configured by _setup_ctypes_interface.
+        argtypes/restype are already configured by _load_library.
         """
         fn = getattr(self.lib, name, None)
         if fn is None:
             return default
         return fn(*args)
 
-    @staticmethod
-    def _c_int32(value: int) -> ctypes.c_int32:
-        return ctypes.c_int32(value)
-
     def _optional_env_ffi(self, name: str, *args, default=None):
         return self._optional_ffi(name, self.env_ptr, *args, default=default)
 
     def _optional_env_i32(self, name: str, *args: int, default=None):
-        return self._optional_env_ffi(
-            name,
-            *(self._c_int32(arg) for arg in args),
-            default=default,
-        )
+        # argtypes declare the int32 parameters, so ctypes converts plain ints
+        return self._optional_env_ffi(name, *args, default=default)
 
     def _optional_env_bool(self, name: str, *args: int, default: bool = False) -> bool:
         return bool(self._optional_env_i32(name, *args, default=int(default)))
@@ -488,7 +583,7 @@ class TribalVillageEnv(pufferlib.PufferEnv):
         out_x, out_y, out_strength = ctypes.c_int32(), ctypes.c_int32(), ctypes.c_int32()
         found = self._optional_env_ffi(
             "tribal_village_get_nearest_threat",
-            self._c_int32(agent_id),
+            agent_id,
             ctypes.byref(out_x), ctypes.byref(out_y), ctypes.byref(out_strength),
             default=0,
         )
@@ -541,7 +636,7 @@ class TribalVillageEnv(pufferlib.PufferEnv):
         """
         return self._optional_env_ffi(
             "tribal_village_get_difficulty",
-            self._c_int32(team_id),
+            team_id,
             default=1.0,
         )
 
@@ -554,8 +649,8 @@ class TribalVillageEnv(pufferlib.PufferEnv):
         """
         self._optional_env_ffi(
             "tribal_village_set_difficulty",
-            self._c_int32(team_id),
-            ctypes.c_float(difficulty),
+            team_id,
+            difficulty,
         )
 
     def set_adaptive_difficulty(self, team_id: int, enabled: bool) -> None:
@@ -577,7 +672,7 @@ class TribalVillageEnv(pufferlib.PufferEnv):
         """
         return self._optional_env_ffi(
             "tribal_village_get_decision_delay_chance",
-            self._c_int32(team_id),
+            team_id,
             default=0.1,
         )
 
@@ -590,8 +685,8 @@ class TribalVillageEnv(pufferlib.PufferEnv):
         """
         self._optional_env_ffi(
             "tribal_village_set_decision_delay_chance",
-            self._c_int32(team_id),
-            ctypes.c_float(chance),
+            team_id,
+            chance,
         )
 
     def enable_adaptive_difficulty(self, team_id: int, target_territory: float = 0.5) -> None:
@@ -606,8 +701,8 @@ class TribalVillageEnv(pufferlib.PufferEnv):
         """
         self._optional_env_ffi(
             "tribal_village_enable_adaptive_difficulty",
-            self._c_int32(team_id),
-            ctypes.c_float(target_territory),
+            team_id,
+            target_territory,
         )
 
     def disable_adaptive_difficulty(self, team_id: int) -> None:
@@ -622,7 +717,7 @@ class TribalVillageEnv(pufferlib.PufferEnv):
         """Get the target territory percentage for adaptive difficulty."""
         return self._optional_env_ffi(
             "tribal_village_get_adaptive_difficulty_target",
-            self._c_int32(team_id),
+            team_id,
             default=0.5,
         )
 
@@ -665,7 +760,7 @@ class TribalVillageEnv(pufferlib.PufferEnv):
         mode_int = self.AI_MODE_MAP.get(self._typed_config.ai_mode, 0)
         self._optional_ffi(
             "tribal_village_set_ai_mode",
-            ctypes.c_int32(mode_int),
+            mode_int,
         )
 
     def _apply_nim_config(self) -> None:
@@ -676,103 +771,276 @@ class TribalVillageEnv(pufferlib.PufferEnv):
         if ok != 1:
             raise RuntimeError("Failed to apply Nim environment config")
 
+    def _observation_views(self) -> dict[str, np.ndarray]:
+        """Per-agent views of the observation buffer, rebuilt only when
+        PufferLib swaps the buffer (e.g. via set_buffers)."""
+        if self._obs_views_source is not self.observations:
+            self._obs_views = dict(zip(self._agent_keys, self.observations))
+            self._obs_views_source = self.observations
+        return dict(self._obs_views)
+
+    def _buffer_pointers(self) -> tuple[int, int, int, int]:
+        """Addresses of the observation, reward, terminal and truncation buffers.
+
+        ``set_buffers`` can rebind the buffers after construction, so the cache is keyed on the array objects rather than filled once.
+        """
+        arrays = self._ptr_arrays
+        if (
+            not arrays
+            or arrays[0] is not self.observations
+            or arrays[1] is not self.rewards
+            or arrays[2] is not self.terminals
+            or arrays[3] is not self.truncations
+        ):
+            arrays = (self.observations, self.rewards, self.terminals, self.truncations)
+            self._ptr_arrays = arrays
+            self._buffer_ptrs = tuple(arr.ctypes.data for arr in arrays)
+        return self._buffer_ptrs
+
     def reset(
-        self, seed: int | None = None, options: dict | None = None
-    ) -> tuple[dict, dict]:
-        """Ultra-fast reset using direct buffers."""
+        self,
+        seed: int | None = None,
+        options: dict | None = None,
+        *,
+        as_dict: bool | None = None,
+    ) -> tuple[dict | np.ndarray, dict]:
+        """Ultra-fast reset using direct buffers.
+
+        With ``as_dict=False`` the observation buffer itself is returned,
+        shaped ``(num_agents, layers, width, height)``, with an empty info dict.
+        ``as_dict`` defaults to False when the env was built on PufferLib
+        buffers (``buf``) and True otherwise.
+        """
+        if as_dict is None:
+            as_dict = self._reset_as_dict
         self.step_count = 0
+        if seed is not None:
+            self._rng = np.random.default_rng(seed)
         self._apply_ai_mode()
 
-        # Get PufferLib managed buffer pointers
-        obs_ptr = self.observations.ctypes.data_as(ctypes.c_void_p)
-        rewards_ptr = self.rewards.ctypes.data_as(ctypes.c_void_p)
-        terminals_ptr = self.terminals.ctypes.data_as(ctypes.c_void_p)
-        truncations_ptr = self.truncations.ctypes.data_as(ctypes.c_void_p)
+        obs_ptr, rewards_ptr, terminals_ptr, truncations_ptr = self._buffer_pointers()
 
         # Direct buffer reset - no conversions
         # Pass seed through FFI for deterministic world generation (0 = random)
-        c_seed = ctypes.c_int32(seed if seed is not None else 0)
-        success = self.lib.tribal_village_reset_and_get_obs(
+        success = self._ffi_reset(
             self.env_ptr, obs_ptr, rewards_ptr, terminals_ptr, truncations_ptr,
-            c_seed
+            seed if seed is not None else 0,
         )
         if not success:
             raise RuntimeError("Failed to reset Nim environment")
 
-        # Return observations as views of PufferLib buffers (no copying!)
-        observations = {
-            f"agent_{i}": self.observations[i] for i in range(self.num_agents)
-        }
-        info = {f"agent_{i}": {} for i in range(self.num_agents)}
+        if not as_dict:
+            return self.observations, {}
 
-        return observations, info
+        # Return observations as views of PufferLib buffers (no copying!)
+        return self._observation_views(), dict.fromkeys(self._agent_keys, _NO_INFO)
 
     def step(
-        self, actions: dict[str, np.ndarray]
-    ) -> tuple[dict, dict, dict, dict, dict]:
-        """Ultra-fast step using direct buffers."""
+        self,
+        actions: dict[str, np.ndarray] | np.ndarray,
+        *,
+        as_dict: bool | None = None,
+    ) -> tuple[Any, Any, Any, Any, dict]:
+        """Ultra-fast step using direct buffers.
+
+        ``actions`` is a dict keyed by agent id or an integer array of length
+        ``num_agents``; out-of-range actions become 0 (noop). With
+        ``as_dict=True`` results are per-agent dicts; with ``as_dict=False``
+        they are the env's observation, reward, terminal and truncation
+        buffers and an empty info dict. ``as_dict`` defaults to matching the
+        input type.
+        """
         self.step_count += 1
-
-        # Clear actions buffer
-        self.actions_buffer.fill(0)
-
-        # Direct action setting (no dict overhead)
-        for i in range(self.num_agents):
-            agent_key = f"agent_{i}"
-            if agent_key in actions:
-                action_value = int(np.asarray(actions[agent_key]).reshape(()))
-                if action_value < 0 or action_value >= self.single_action_space.n:
-                    action_value = 0
-                self.actions_buffer[i] = np.uint16(action_value)
-
-        # Get PufferLib managed buffer pointers
-        actions_ptr = self.actions_buffer.ctypes.data_as(ctypes.c_void_p)
-        obs_ptr = self.observations.ctypes.data_as(ctypes.c_void_p)
-        rewards_ptr = self.rewards.ctypes.data_as(ctypes.c_void_p)
-        terminals_ptr = self.terminals.ctypes.data_as(ctypes.c_void_p)
-        truncations_ptr = self.truncations.ctypes.data_as(ctypes.c_void_p)
+        n_actions = self.single_action_space.n
+        is_array = isinstance(actions, np.ndarray)
+        if as_dict is None:
+            as_dict = not is_array
+
+        if is_array:
+            flat = actions.reshape(self.num_agents)
+            valid = (flat >= 0) & (flat < n_actions)
+            np.copyto(self.actions_buffer, np.where(valid, flat, 0), casting="unsafe")
+        else:
+            # Agents missing from the dict take noop; only listed ones are written
+            self.actions_buffer.fill(0)
+            agent_index = self._agent_index
+            for agent_key, action in actions.items():
+                i = agent_index.get(agent_key)
+                if i is None or action is None:
+                    continue
+                action_value = int(np.asarray(action).reshape(()))
+                if 0 <= action_value < n_actions:
+                    self.actions_buffer[i] = action_value
 
         # Direct buffer step - no conversions
-        success = self.lib.tribal_village_step_with_pointers(
-            self.env_ptr,
-            actions_ptr,
-            obs_ptr,
-            rewards_ptr,
-            terminals_ptr,
-            truncations_ptr,
-        )
+        success = self._ffi_step(self.env_ptr, self._actions_ptr, *self._buffer_pointers())
         if not success:
             raise RuntimeError("Failed to step Nim environment")
 
+        if self.step_count >= self.max_steps:
+            self.truncations.fill(True)
+
+        if not as_dict:
+            return self.observations, self.rewards, self.terminals, self.truncations, {}
+
         # Return results as views of PufferLib buffers (no copying!)
-        observations = {
-            f"agent_{i}": self.observations[i] for i in range(self.num_agents)
-        }
-        rewards = {f"agent_{i}": float(self.rewards[i]) for i in range(self.num_agents)}
-        terminated = {
-            f"agent_{i}": bool(self.terminals[i]) for i in range(self.num_agents)
-        }
-        truncated = {
-            f"agent_{i}": bool(self.truncations[i])
-            or (self.step_count >= self.max_steps)
-            for i in range(self.num_agents)
-        }
-        infos = {f"agent_{i}": {} for i in range(self.num_agents)}
+        keys = self._agent_keys
+        rewards = dict(zip(keys, self.rewards.tolist()))
+        # tolist() yields native Python scalars in one C pass; the buffers are
+        # already bool under PufferLib, so astype(copy=False) is a no-op there
+        terminated = dict(zip(keys, self.terminals.astype(bool, copy=False).tolist()))
+        truncated = dict(zip(keys, self.truncations.astype(bool, copy=False).tolist()))
+        infos = dict.fromkeys(keys, _NO_INFO)
+
+        return self._observation_views(), rewards, terminated, truncated, infos
 
-        return observations, rewards, terminated, truncated, infos
+    def sample_actions(self) -> np.ndarray:
+        """Draw one uniform random action per agent as an int32 array.
+
+        Uses a single vectorized Generator call; the generator is reseeded
+        when ``reset`` is given a seed.
+        """
+        return self._rng.integers(
+            0, self.single_action_space.n, size=self.num_agents, dtype=np.int32
+        )
+
+    def run_fixed_action(self, n_steps: int, action: int = 0) -> np.ndarray:
+        """Advance ``n_steps`` with every agent taking the same ``action``.
+
+        A driver loop for benchmarks and smoke runs: buffer pointers are
+        computed once and nothing is built per step. The PufferLib buffers
+        hold the final step afterwards. Returns per-agent rewards summed over
+        the run.
+        """
+        if not 0 <= action < self.single_action_space.n:
+            action = 0
+        self.actions_buffer.fill(action)
+        args = (self.env_ptr, self._actions_ptr, *self._buffer_pointers())
+        step = self._ffi_step
+        total_rewards = np.zeros(self.num_agents, dtype=np.float32)
+        for _ in range(n_steps):
+            if not step(*args):
+                raise RuntimeError("Failed to step Nim environment")
+            self.step_count += 1
+            total_rewards += self.rewards
+        if self.step_count >= self.max_steps:
+            self.truncations.fill(True)
+        return total_rewards
+
+    def _ensure_batch_buffers(self, n_steps: int) -> None:
+        """Grow the step_batch() output buffers to hold at least n_steps."""
+        if n_steps <= self._batch_capacity:
+            return
+        capacity = max(n_steps, 2 * self._batch_capacity)
+        self._batch_obs = np.zeros(
+            (capacity, self.num_agents, *self.single_observation_space.shape),
+            dtype=np.uint8,
+        )
+        self._batch_rewards = np.zeros((capacity, self.num_agents), dtype=np.float32)
+        # Nim writes 0/1 bytes, so these can share PufferLib's bool dtype
+        self._batch_terminals = np.zeros((capacity, self.num_agents), dtype=bool)
+        self._batch_truncations = np.zeros((capacity, self.num_agents), dtype=bool)
+        self._batch_capacity = capacity
+
+    def step_batch(
+        self, actions: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Run several steps with a single FFI call.
+
+        ``actions`` has shape ``(n_steps, num_agents)``; row ``i`` is applied
+        on step ``i``. Out-of-range actions become 0 (noop), as in ``step``.
+
+        Returns stacked ``(observations, rewards, terminals, truncations)``
+        arrays with a leading ``n_steps`` axis. They are views of buffers that
+        the next call overwrites. The final step is also written to the
+        PufferLib buffers, so ``env.observations`` etc. stay current.
+        """
+        actions = np.asarray(actions)
+        if actions.ndim != 2 or actions.shape[1] != self.num_agents:
+            raise ValueError(
+                f"actions must have shape (n_steps, {self.num_agents}), got {actions.shape}"
+            )
+        n_steps = actions.shape[0]
+        valid = (actions >= 0) & (actions < self.single_action_space.n)
+        batch_actions = np.where(valid, actions, 0).astype(np.uint16)
+
+        self._ensure_batch_buffers(n_steps)
+        obs = self._batch_obs[:n_steps]
+        rewards = self._batch_rewards[:n_steps]
+        terminals = self._batch_terminals[:n_steps]
+        truncations = self._batch_truncations[:n_steps]
+        if n_steps == 0:
+            return obs, rewards, terminals, truncations
+
+        # Raw addresses: ctypes converts ints to c_void_p without building
+        # a pointer object per argument
+        arrays = (batch_actions, obs, rewards, terminals, truncations)
+        actions_addr, obs_addr, rewards_addr, terminals_addr, truncations_addr = (
+            arr.ctypes.data for arr in arrays
+        )
+        if self._ffi_step_batch is not None:
+            completed = self._ffi_step_batch(
+                self.env_ptr,
+                actions_addr,
+                n_steps,
+                obs_addr,
+                rewards_addr,
+                terminals_addr,
+                truncations_addr,
+            )
+        else:
+            # Older library without the batch entry point: step row by row
+            strides = tuple(arr.strides[0] for arr in arrays)
+            completed = 0
+            for i in range(n_steps):
+                if not self._ffi_step(
+                    self.env_ptr,
+                    actions_addr + i * strides[0],
+                    obs_addr + i * strides[1],
+                    rewards_addr + i * strides[2],
+                    terminals_addr + i * strides[3],
+                    truncations_addr + i * strides[4],
+                ):
+                    break
+                completed += 1
+        self.step_count += completed
+        if completed != n_steps:
+            raise RuntimeError("Failed to step Nim environment")
+
+        # Apply the max_steps cutoff per step, as step() does
+        first_step = self.step_count - n_steps + 1
+        step_numbers = np.arange(first_step, self.step_count + 1)
+        truncations[step_numbers >= self.max_steps] = True
+
+        np.copyto(self.observations, obs[-1])
+        np.copyto(self.rewards, rewards[-1])
+        np.copyto(self.terminals, terminals[-1])
+        np.copyto(self.truncations, truncations[-1])
+
+        return obs, rewards, terminals, truncations
 
     def close(self):
-        """Clean up the environment."""
-        if hasattr(self, "env_ptr") and self.env_ptr:
-            self.lib.tribal_village_destroy(self.env_ptr)
-            self.env_ptr = None
+        """Clean up the environment. Safe to call more than once."""
+        if hasattr(self, "_finalizer"):
+            self._finalizer()
+        self.env_ptr = None
 
 
 def make_tribal_village_env(
-    config: dict[str, Any] | None = None, **kwargs
+    config: EnvironmentConfig | dict[str, Any] | None = None, **kwargs
 ) -> TribalVillageEnv:
-    """Factory function for ultra-fast tribal village environment."""
-    if config is None:
-        config = {}
-    config.update(kwargs)
-    return TribalVillageEnv(config=config)
+    """Factory function for ultra-fast tribal village environment.
+
+    ``kwargs`` use the legacy flat names (``max_steps``, ``heart_reward``, ...)
+    and override ``config``. The merged settings are validated into an
+    ``EnvironmentConfig`` once here; the caller's dict is left untouched.
+    """
+    if isinstance(config, EnvironmentConfig):
+        if not kwargs:
+            return TribalVillageEnv(config=config)
+        config = {
+            **config.to_legacy_dict(),
+            "ansi_buffer_size": config.ansi_buffer_size,
+        }
+    typed_config = EnvironmentConfig.from_legacy_dict({**(config or {}), **kwargs})
+    return TribalVillageEnv(config=typed_config)